@@ -0,0 +1,127 @@
+import json
+from uuid import uuid4
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+# replace user outstanding code with the new one, KEYS: user index key, ARGV: code, payload, timeout, code key prefix
+ISSUE_CODE_SCRIPT = """
+local old = redis.call('GET', KEYS[1])
+if old then
+    redis.call('DEL', ARGV[4] .. old)
+end
+redis.call('SET', ARGV[4] .. ARGV[1], ARGV[2], 'EX', ARGV[3])
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+"""
+
+# delete code, and user index only if it still point to this code
+REVOKE_CODE_SCRIPT = """
+redis.call('DEL', KEYS[1])
+if redis.call('GET', KEYS[2]) == ARGV[1] then
+    redis.call('DEL', KEYS[2])
+end
+"""
+
+
+class ActivationCodeStore:
+    """
+    activation codes saved on redis with reverse index of user id to its outstanding code,
+    so issue new code for user atomically invalidate the old one.
+
+    user data saved as compact json array, see ``fields``
+    """
+    prefix = 'activation'
+    fields = 'id', 'username', 'first_name', 'last_name', 'email',
+
+    def __init__(self, timeout: int = 86400):
+        self.timeout = timeout
+        self._issue_script = None
+        self._revoke_script = None
+
+    @property
+    def connection(self):
+        return get_redis_connection('default')
+
+    @property
+    def code_prefix(self) -> str:
+        return f'{self.prefix}:code:'
+
+    def code_key(self, code) -> str:
+        return f'{self.code_prefix}{code}'
+
+    def user_key(self, user_id: int) -> str:
+        return f'{self.prefix}:user:{user_id}'
+
+    def dumps(self, data: dict) -> str:
+        return json.dumps([data.get(field) for field in self.fields], separators=(',', ':'), ensure_ascii=False)
+
+    def loads(self, value) -> dict:
+        return dict(zip(self.fields, json.loads(value)))
+
+    def get_issue_script(self):
+        if self._issue_script is None:
+            self._issue_script = self.connection.register_script(ISSUE_CODE_SCRIPT)
+        return self._issue_script
+
+    def get_revoke_script(self):
+        if self._revoke_script is None:
+            self._revoke_script = self.connection.register_script(REVOKE_CODE_SCRIPT)
+        return self._revoke_script
+
+    def save_many(self, entries: dict) -> None:
+        """
+        save codes with one pipelined round trip, outstanding codes of same users invalidated
+        :param entries: dict of code and user data, user data must contain "id"
+        """
+        script = self.get_issue_script()
+        with self.connection.pipeline(transaction=False) as pipeline:
+            for code, data in entries.items():
+                script(
+                    keys=[self.user_key(data['id'])],
+                    args=[str(code), self.dumps(data), self.timeout, self.code_prefix],
+                    client=pipeline,
+                )
+            pipeline.execute()
+
+    def save(self, code, data: dict) -> None:
+        self.save_many({code: data})
+
+    def issue_many(self, users) -> dict:
+        """
+        generate new activation codes for users
+        :return: dict of user id and its activation code
+        """
+        codes = {user.pk: str(uuid4()) for user in users}
+        self.save_many({codes[user.pk]: user.activation_data for user in users})
+        return codes
+
+    def issue(self, user) -> str:
+        return self.issue_many([user])[user.pk]
+
+    def get(self, code):
+        """
+        :return: user data dict of the code, None if code not exist or expired
+        """
+        value = self.connection.get(self.code_key(code))
+        return None if value is None else self.loads(value)
+
+    def get_user_code(self, user_id: int):
+        """
+        :return: outstanding activation code of user, None if no code
+        """
+        code = self.connection.get(self.user_key(user_id))
+        return None if code is None else code.decode()
+
+    def revoke(self, code, user_id: int) -> None:
+        self.get_revoke_script()(keys=[self.code_key(code), self.user_key(user_id)], args=[str(code)])
+
+    def revoke_user(self, user_id: int) -> None:
+        """
+        revoke outstanding activation code of user if any
+        """
+        code = self.get_user_code(user_id)
+        if code is not None:
+            self.revoke(code, user_id)
+
+
+activation_codes = ActivationCodeStore(timeout=getattr(settings, 'ACTIVATION_CODE_TIMEOUT', 86400))
@@ -14,7 +14,7 @@ admin.site.unregister(BaseGroup)
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
     fieldsets = (
-        (None, {'fields': ('username', 'password', 'token')}),
+        (None, {'fields': ('username', 'password', 'token', 'token_expires')}),
         (_('Personal info'), {'fields': ('first_name', 'last_name', 'email')}),
         (_('Account status'), {
             'fields': ('is_active', 'is_staff', 'is_superuser'),
@@ -34,7 +34,7 @@ class UserAdmin(BaseUserAdmin):
             'fields': ('is_active', 'is_staff'),
         }),
     )
-    readonly_fields = 'token', 'is_superuser', 'date_joined', 'last_login', 'is_verified',
+    readonly_fields = 'token', 'token_expires', 'is_superuser', 'date_joined', 'last_login', 'is_verified',
 
     add_form = UserCreationForm
     list_display = '__str__', 'username', 'is_staff', 'is_active', 'date_joined',
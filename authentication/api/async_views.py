@@ -0,0 +1,69 @@
+import asyncio
+from math import ceil
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.utils.translation import ugettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException, Throttled
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+
+from authentication.api.serializers import FacilityStaffAuthSerializer
+from authentication.api.throttling import LOGIN_THROTTLES
+from authentication.hashing import hash_password, needs_rehash, verify_password
+from utilities.restful.versioning import APIHeaderVersioning
+
+
+def envelope(result=None, error=None, status_code=status.HTTP_200_OK) -> JsonResponse:
+    """
+    build response with the same criteria of ``utilities.restful.renderers.JSONRenderer``
+    """
+    if error is not None:
+        return JsonResponse({'error': error, 'status': False}, status=status_code)
+    return JsonResponse({'result': result, 'status': True}, status=status_code)
+
+
+def check_throttles(request) -> None:
+    for throttle_class in LOGIN_THROTTLES:
+        throttle = throttle_class()
+        if not throttle.allow_request(request, None):
+            raise Throttled(throttle.wait())
+
+
+async def facility_staff_login(request):
+    """
+    async version of ``FacilityStaffAuthViewSet.login``, served by ASGI application (root/asgi.py)
+    password hash computed on hashing executor and awaited, so event loop keep serving other requests
+    """
+    if request.method != 'POST':
+        return envelope(error=_('Method "%s" not allowed.') % request.method, status_code=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    try:
+        APIHeaderVersioning().determine_version(request)
+        request = Request(request, parsers=[JSONParser()])
+        await sync_to_async(check_throttles)(request)
+
+        serializer = FacilityStaffAuthSerializer(data=request.data)
+        if not await sync_to_async(serializer.is_valid)():
+            return envelope(error=serializer.errors, status_code=status.HTTP_400_BAD_REQUEST)
+
+        user = serializer.get_member(serializer.validated_data)
+        password = serializer.validated_data['password']
+        is_password = await asyncio.wrap_future(verify_password(password, user.password))
+        serializer.check_credentials(is_password)
+        if needs_rehash(user.password):
+            encoded = await asyncio.wrap_future(hash_password(password))
+            await sync_to_async(serializer.upgrade_password)(user, encoded)
+        user = await sync_to_async(serializer.issue_token)(user)
+    except APIException as ex:
+        response = envelope(error=ex.detail, status_code=ex.status_code)
+        if getattr(ex, 'wait', None):
+            response['Retry-After'] = str(ceil(ex.wait))
+        return response
+
+    return envelope(result=serializer.to_representation(user))
+
+
+# api clients authenticated by credentials in body, not by session cookies
+facility_staff_login.csrf_exempt = True
@@ -1,17 +1,28 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.utils.translation import ugettext_lazy as _
 from rest_framework import serializers
 
-from corporations.models import Facility
+from authentication.hashing import hash_password, needs_rehash, verify_password
+from corporations.registry import facilities
+from utilities.restful.fieldsets import SparseFieldsetMixin
+from utilities.restful.serializers import CompiledSerializer
 
 User = get_user_model()
 
 
-class FacilityStaffProfileSerializer(serializers.ModelSerializer):
+class FacilityStaffProfileSerializer(SparseFieldsetMixin, CompiledSerializer):
+    token = serializers.SerializerMethodField()
+
     class Meta:
         model = User
         fields = 'token', 'username', 'full_name',
 
+    def get_token(self, instance: User) -> str:
+        if settings.AUTH_SIGNED_TOKENS:
+            return instance.generate_signed_token()
+        return instance.token
+
 
 class FacilityStaffAuthSerializer(serializers.Serializer):
     facility = serializers.CharField(required=True)
@@ -21,53 +32,86 @@ class FacilityStaffAuthSerializer(serializers.Serializer):
     class Meta:
         fields = 'facility', 'username', 'password',
 
-    def validate_facility(self, value):
-        try:
-            return Facility.objects.get(is_active=True, uid=value)
-        except Facility.DoesNotExist:
+    facility_error = _(
+        'This facility no longer exists or has been deactivated, '
+        'please contact with support for more details'
+    )
+    user_error = _(
+        'This user no longer exists or has been deactivated, '
+        'please contact with support for more details'
+    )
+    permission_error = _('Unable to use this service, you not have right permissions')
+
+    def validate(self, attrs):
+        """
+        resolve facility from facilities registry cache, then user and his employee membership with one query
+        """
+        facility = facilities.get_active(attrs.get('facility'))
+        user = User.objects.select_related('facility_staff').filter(
+            username=attrs.get('username'),
+            is_active=True
+        ).first()
+
+        errors = {}
+        if facility is None:
+            errors['facility'] = [self.facility_error]
+        if user is None:
+            errors['username'] = [self.user_error]
+        # check if user is Employee
+        elif not hasattr(user, 'facility_staff'):
+            errors['username'] = [self.permission_error]
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        attrs['username'] = user
+        attrs['facility'] = facility.id
+        return attrs
+
+    def get_member(self, validated_data):
+        """
+        :return: validated user if he is employee of requested facility
+        """
+        user = validated_data.get('username')
+        if user.facility_staff.facility_id != validated_data.get('facility'):
             raise serializers.ValidationError(_(
-                'This facility no longer exists or has been deactivated, '
-                'please contact with support for more details'
+                'You are not associated to this facility, '
+                'please get help from facility admin'
             ))
+        return user
 
-    def validate_username(self, value):
-        try:
-            user = User.objects.prefetch_related('facility_staff').get(username=value, is_active=True)
-            # check if user is Employee
-            if not hasattr(user, 'facility_staff'):
-                raise serializers.ValidationError(_('Unable to use this service, you not have right permissions'))
-            return user
-        except User.DoesNotExist:
+    def check_credentials(self, is_password: bool) -> None:
+        if not is_password:
             raise serializers.ValidationError(_(
-                'This user no longer exists or has been deactivated, '
-                'please contact with support for more details'
+                'You have entered wrong credentials, please retry with case-sensitive credentials'
             ))
 
+    def upgrade_password(self, user, encoded: str) -> None:
+        """
+        save password hashed with current hasher settings, called after successful login
+        """
+        user.password = encoded
+        user.save(update_fields=['password'])
+
+    def issue_token(self, user):
+        # generate token if user not have token or it expired
+        if not user.token or user.is_token_expired:
+            user.generate_token(commit=True)
+        return user
+
     def create(self, validated_data):
-        user = validated_data.get('username')
-        facility = validated_data.get('facility')
-
-        if user.facility_staff.facility_id == facility.id:
-            is_password = user.check_password(validated_data.get('password'))
-            if not is_password:
-                raise serializers.ValidationError(_(
-                    'You have entered wrong credentials, please retry with case-sensitive credentials'
-                ))
-            # generate token if user not have token
-            if not user.token:
-                user.generate_token(commit=True)
-            return user
-        else:
-            raise serializers.ValidationError(_(
-                'You are not associated to this facility, '
-                'please get help from facility admin'
-            ))
+        user = self.get_member(validated_data)
+        # password hashed on hashing executor, see ``authentication.hashing``
+        password = validated_data.get('password')
+        self.check_credentials(verify_password(password, user.password).result())
+        if needs_rehash(user.password):
+            self.upgrade_password(user, hash_password(password).result())
+        return self.issue_token(user)
 
     def update(self, instance, validated_data):
         raise serializers.ValidationError('Unexpected action triggered')
 
     def to_representation(self, instance: User):
-        rep_serializer = FacilityStaffProfileSerializer(instance=instance)
+        rep_serializer = FacilityStaffProfileSerializer(instance=instance, context=self.context)
         return rep_serializer.data
 
 
@@ -79,7 +123,9 @@ class FacilityStaffChangePasswordSerializer(serializers.Serializer):
 
     def validate_password(self, value):
         user = self.instance
-        if user and user.check_password(value):
+        # hash the new password while comparing it with the old one
+        self._encoded_password = hash_password(value)
+        if user and verify_password(value, user.password).result():
             raise serializers.ValidationError(_("You can't use same password again."))
         return value
 
@@ -87,8 +133,10 @@ class FacilityStaffChangePasswordSerializer(serializers.Serializer):
         raise serializers.ValidationError('Unexpected action triggered')
 
     def update(self, instance, validated_data):
-        instance.set_password(validated_data.get('password'))
-        instance.save()
+        instance.password = self._encoded_password.result()
+        instance._password = validated_data.get('password')
+        # request user may be cached snapshot, never write back its other fields
+        instance.save(update_fields=['password'])
         return instance
 
     def to_representation(self, instance):
@@ -0,0 +1,22 @@
+from utilities.restful.throttling import DataSlidingWindowThrottle, IPSlidingWindowThrottle
+
+
+class LoginIPThrottle(IPSlidingWindowThrottle):
+    scope = 'login_ip'
+
+
+class LoginFacilityThrottle(DataSlidingWindowThrottle):
+    scope = 'login_facility'
+    data_fields = 'facility',
+
+
+class LoginUsernameThrottle(DataSlidingWindowThrottle):
+    scope = 'login_username'
+    data_fields = 'username',
+
+
+class ActivationIPThrottle(IPSlidingWindowThrottle):
+    scope = 'activation_ip'
+
+
+LOGIN_THROTTLES = LoginIPThrottle, LoginFacilityThrottle, LoginUsernameThrottle,
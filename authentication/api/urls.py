@@ -1,5 +1,7 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
+from authentication.api.async_views import facility_staff_login
 from authentication.api.views import FacilityStaffAuthViewSet, UsersViewSet
 
 app_name = 'auth'
@@ -8,4 +10,6 @@ router = DefaultRouter()
 router.register('facility-staff', FacilityStaffAuthViewSet, basename='facility_staff')
 router.register('', UsersViewSet, basename='users')
 
-urlpatterns = router.urls
+urlpatterns = [
+    path('facility-staff/async-login/', facility_staff_login, name='facility_staff-async-login'),
+] + router.urls
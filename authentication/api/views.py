@@ -1,5 +1,4 @@
 from django.contrib.auth import get_user_model
-from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
 from rest_framework import status
 from rest_framework.decorators import action
@@ -8,10 +7,13 @@ from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 from django.utils.translation import ugettext_lazy as _
 
+from authentication.activation import activation_codes
 from authentication.api.serializers import (
     FacilityStaffAuthSerializer,
     FacilityStaffChangePasswordSerializer, AuthActivateAccountSerializer
 )
+from authentication.api.throttling import LOGIN_THROTTLES, ActivationIPThrottle
+from utilities.restful.authentication import revoke_token
 
 User = get_user_model()
 
@@ -24,13 +26,25 @@ class FacilityStaffAuthViewSet(GenericViewSet):
             self.permission_classes = AllowAny,
         return super().get_permissions()
 
-    @action(methods=['post'], detail=False)
+    @action(methods=['post'], detail=False, throttle_classes=LOGIN_THROTTLES)
     def login(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         serializer.save()
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @action(methods=['post'], detail=False)
+    def logout(self, request, *args, **kwargs):
+        """
+        revoke the token used to authenticate this request
+        """
+        user = request.user
+        if request.auth == user.token:
+            user.revoke_token(commit=True)
+        else:
+            revoke_token(request.auth)
+        return Response(_('You have been logged out successfully.'), status=status.HTTP_200_OK)
+
     @action(methods=['put'], detail=False, url_path='change-password')
     def change_password(self, request, *args, **kwargs):
         serializer = FacilityStaffChangePasswordSerializer(data=request.data, instance=self.request.user)
@@ -46,7 +60,8 @@ class UsersViewSet(GenericViewSet):
         methods=['get', 'put'],
         detail=False,
         url_path=r'activation/(?P<code>[a-f0-9]{8}-?[a-f0-9]{4}-?4[a-f0-9]{3}-?[89ab][a-f0-9]{3}-?[a-f0-9]{12})',
-        permission_classes=[AllowAny]
+        permission_classes=[AllowAny],
+        throttle_classes=[ActivationIPThrottle]
     )
     def activation(self, request, code: str, *args, **kwargs):
         """
@@ -56,7 +71,7 @@ class UsersViewSet(GenericViewSet):
         :param args:
         :param kwargs:
         """
-        user_data = cache.get(code)
+        user_data = activation_codes.get(code)
         # make sure the code still filed
         if not user_data:
             return Response(_('Invalid activation Link.'), status=status.HTTP_404_NOT_FOUND)
@@ -76,8 +91,8 @@ class UsersViewSet(GenericViewSet):
             serializer.is_valid(raise_exception=True)
             serializer.save()
 
-            # delete cache code after activation process finish
-            cache.delete(code)
+            # delete activation code after activation process finish
+            activation_codes.revoke(code, user_data['id'])
             return Response(_('Account has been activated successfully'), status=status.HTTP_200_OK)
         except ObjectDoesNotExist:
             return Response(
@@ -5,3 +5,6 @@ from django.utils.translation import ugettext_lazy as _
 class UsersConfig(AppConfig):
     name = 'authentication'
     verbose_name = _("Authentication and Authorization")
+
+    def ready(self):
+        import authentication.signals
@@ -0,0 +1,44 @@
+from django.conf import settings
+
+from utilities.bloom import BloomFilter
+
+_options = getattr(settings, 'AVAILABILITY_BLOOM_FILTER', {})
+
+# fields checked by availability checks, every field has its own filter
+availability_filters = {
+    field: BloomFilter(
+        key=f'bloom:users:{field}',
+        capacity=_options.get('CAPACITY', 1000000),
+        error_rate=_options.get('ERROR_RATE', 0.001),
+    )
+    for field in ('username', 'email', 'token')
+}
+
+
+def is_enabled() -> bool:
+    return getattr(settings, 'AVAILABILITY_BLOOM_FILTER', {}).get('ENABLED', False)
+
+
+def remember_users(*users, fields=None) -> None:
+    """
+    add users username, email and token to filters, must be called for users created or changed
+    without model signals (ex: bulk create)
+    :param fields: changed fields, by default all filters fields
+    """
+    if not is_enabled():
+        return
+    for field in fields or availability_filters:
+        availability_filters[field].add(*(getattr(user, field) for user in users))
+
+
+def maybe_taken(field: str, values) -> set:
+    """
+    :return: subset of values may be taken, values out of it are definitely available
+    """
+    if not is_enabled():
+        return set(values)
+    result = availability_filters[field].contains(values)
+    if result is None:
+        # filter not built yet
+        return set(values)
+    return {value for value, found in result.items() if found}
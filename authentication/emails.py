@@ -0,0 +1,80 @@
+from threading import Lock
+
+from django.conf import settings
+from django.template import TemplateDoesNotExist, engines
+from django.template.loader import select_template
+from django.utils import translation
+from django.utils.html import strip_tags
+
+
+class CompiledEmail:
+    """
+    compiled html template and its plain text alternative
+    """
+
+    def __init__(self, html_template, text_template):
+        self.html_template = html_template
+        self.text_template = text_template
+
+    def render(self, context: dict) -> tuple:
+        """
+        :return: tuple of (plain text, html) messages
+        """
+        return self.text_template.render(context), self.html_template.render(context)
+
+
+class EmailTemplates:
+    """
+    process wide registry of compiled email templates, every template loaded and compiled once per language.
+
+    language specific template ``email/<language>/<name>.html`` preferred over ``email/<name>.html``,
+    plain text alternative loaded from ``.txt`` template beside the html one, if not exist
+    it made once by stripping tags of html template source.
+    """
+
+    def __init__(self):
+        self._compiled = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def candidates(name: str, language: str, extension: str) -> list:
+        directory, _, filename = name.rpartition('/')
+        base = filename.rsplit('.', 1)[0]
+        prefix = f'{directory}/' if directory else ''
+        return [f'{prefix}{language}/{base}.{extension}', f'{prefix}{base}.{extension}']
+
+    def compile(self, name: str, language: str) -> CompiledEmail:
+        html_template = select_template(self.candidates(name, language, 'html'))
+        try:
+            text_template = select_template(self.candidates(name, language, 'txt'))
+        except TemplateDoesNotExist:
+            source = html_template.template.source
+            text_template = engines['django'].from_string(strip_tags(source))
+        return CompiledEmail(html_template, text_template)
+
+    def get(self, name: str, language: str = None) -> CompiledEmail:
+        language = language or translation.get_language() or settings.LANGUAGE_CODE
+        key = (name, language)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            with self._lock:
+                compiled = self._compiled.get(key)
+                if compiled is None:
+                    compiled = self._compiled[key] = self.compile(name, language)
+        return compiled
+
+    def render(self, name: str, context: dict, language: str = None) -> tuple:
+        """
+        :param name: html email template path
+        :param context: dict object represent template context
+        :param language: template language, default is active language
+        :return: tuple of (plain text, html) messages
+        """
+        return self.get(name, language).render(context)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._compiled.clear()
+
+
+email_templates = EmailTemplates()
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2 hasher with work factor set by ``PASSWORD_HASHER_ITERATIONS`` setting,
+    use ``calibratehashers`` command to choose iterations for the target login latency.
+
+    It keep django algorithm name, so existing pbkdf2_sha256 hashes still verified
+    and upgraded to the configured iterations on next successful login.
+    """
+
+    @property
+    def iterations(self) -> int:
+        return getattr(settings, 'PASSWORD_HASHER_ITERATIONS', None) or PBKDF2PasswordHasher.iterations
@@ -0,0 +1,83 @@
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from threading import Lock
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+_executor = None
+_executor_lock = Lock()
+
+
+def _setup_worker() -> None:
+    # process workers need django configured before use password hashers
+    import django
+    django.setup()
+
+
+def create_process_pool(max_workers: int = None) -> ProcessPoolExecutor:
+    """
+    process pool with django configured on every worker, to hash passwords on all CPU cores
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, initializer=_setup_worker)
+
+
+def get_executor():
+    """
+    lazy create the password hashing executor configured by ``PASSWORD_HASHING_EXECUTOR`` setting
+    :return: thread or process pool executor, None when hashing run inline on caller thread
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                options = getattr(settings, 'PASSWORD_HASHING_EXECUTOR', {})
+                backend = options.get('BACKEND', 'inline')
+                max_workers = options.get('MAX_WORKERS') or None
+                if backend == 'process':
+                    _executor = create_process_pool(max_workers)
+                elif backend == 'thread':
+                    _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='password-hashing')
+                elif backend != 'inline':
+                    raise ValueError(f'Unknown password hashing executor backend "{backend}"')
+    return _executor
+
+
+def submit(fn, *args) -> Future:
+    executor = get_executor()
+    if executor is not None:
+        return executor.submit(fn, *args)
+
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as ex:
+        future.set_exception(ex)
+    return future
+
+
+def verify_password(password: str, encoded: str) -> Future:
+    """
+    compare raw password with encoded one on hashing executor
+    :return: future of boolean flag
+    """
+    return submit(hashers.check_password, password, encoded)
+
+
+def needs_rehash(encoded: str) -> bool:
+    """
+    check if encoded password made by old hasher or old work factor, cheap check without hashing
+    """
+    preferred = hashers.get_hasher('default')
+    try:
+        hasher = hashers.identify_hasher(encoded)
+    except ValueError:
+        return False
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+def hash_password(password: str) -> Future:
+    """
+    hash raw password with the default hasher on hashing executor
+    :return: future of encoded password string
+    """
+    return submit(hashers.make_password, password)
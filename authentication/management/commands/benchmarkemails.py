@@ -0,0 +1,75 @@
+from statistics import median
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.utils.html import strip_tags
+
+from authentication.emails import EmailTemplates
+
+
+class Command(BaseCommand):
+    help = 'Measure per message cost of rendering email template, compiled templates vs render_to_string + strip_tags'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '-t',
+            '--template',
+            dest='template',
+            default='email/account_activation.html',
+            help='Email html template path',
+        )
+        parser.add_argument(
+            '-n',
+            '--messages',
+            type=int,
+            dest='messages',
+            default=1000,
+            help='Number of rendered messages per run',
+        )
+        parser.add_argument(
+            '-s',
+            '--samples',
+            type=int,
+            dest='samples',
+            default=5,
+            help='Number of runs, median time used',
+        )
+
+    @staticmethod
+    def context(index: int) -> dict:
+        return {'code': f'00000000-0000-4000-8000-{index:012d}', 'name': f'user {index}'}
+
+    def measure(self, render, messages: int, samples: int) -> float:
+        """
+        :return: median time of render one message in microseconds
+        """
+        timings = []
+        for _ in range(samples):
+            started = perf_counter()
+            for index in range(messages):
+                render(self.context(index))
+            timings.append((perf_counter() - started) / messages * 1_000_000)
+        return median(timings)
+
+    def handle(self, *args, **options):
+        template = options['template']
+        messages = options['messages']
+        samples = options['samples']
+
+        def render_inline(context):
+            html_message = render_to_string(template_name=template, context=context)
+            return strip_tags(html_message), html_message
+
+        templates = EmailTemplates()
+        results = {
+            'render_to_string + strip_tags': self.measure(render_inline, messages, samples),
+        }
+        for language, _ in settings.LANGUAGES:
+            compiled = templates.get(template, language)
+            results[f'compiled ({language})'] = self.measure(compiled.render, messages, samples)
+
+        baseline = results['render_to_string + strip_tags']
+        for name, elapsed in results.items():
+            self.stdout.write(f'{name}: {elapsed:.1f}µs per message ({baseline / elapsed:.1f}x)')
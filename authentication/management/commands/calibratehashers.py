@@ -0,0 +1,73 @@
+from math import log2
+from statistics import median
+from time import perf_counter
+
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Benchmark configured PASSWORD_HASHERS on this machine and recommend work factor for target latency'
+    password = 'calibration-password'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '-t',
+            '--target',
+            type=float,
+            dest='target',
+            default=250,
+            help='Target hashing time in milliseconds',
+        )
+        parser.add_argument(
+            '-s',
+            '--samples',
+            type=int,
+            dest='samples',
+            default=3,
+            help='Number of hashing runs per hasher, median time used',
+        )
+
+    def measure(self, hasher, samples: int) -> float:
+        """
+        :return: median time of encode password in milliseconds
+        """
+        timings = []
+        for _ in range(samples):
+            salt = hasher.salt()
+            started = perf_counter()
+            hasher.encode(self.password, salt)
+            timings.append((perf_counter() - started) * 1000)
+        return median(timings)
+
+    def recommend(self, hasher, elapsed: float, target: float) -> str:
+        ratio = target / elapsed
+        if hasattr(hasher, 'iterations'):
+            # PBKDF2 cost grow linearly with iterations
+            iterations = max(int(hasher.iterations * ratio) // 1000 * 1000, 1000)
+            return f'iterations={iterations}'
+        if hasattr(hasher, 'rounds'):
+            # bcrypt cost double with every round
+            return f'rounds={max(round(hasher.rounds + log2(ratio)), 4)}'
+        if hasattr(hasher, 'time_cost'):
+            # argon2 keep memory cost and tune passes
+            return f'time_cost={max(round(hasher.time_cost * ratio), 1)} memory_cost={hasher.memory_cost}'
+        return 'no tunable parameters'
+
+    def handle(self, *args, **options):
+        target = options['target']
+        samples = options['samples']
+
+        for index, hasher in enumerate(get_hashers()):
+            name = f'{hasher.__class__.__name__} ({hasher.algorithm})'
+            try:
+                elapsed = self.measure(hasher, samples)
+            except ValueError as ex:
+                # hasher library not installed
+                self.stdout.write(f'{name}: skipped, {ex}')
+                continue
+
+            self.stdout.write(
+                f'{name}{" [default]" if index == 0 else ""}: {elapsed:.1f}ms, '
+                f'recommended for {target:.0f}ms: {self.recommend(hasher, elapsed, target)}'
+            )
@@ -0,0 +1,46 @@
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from authentication.availability import availability_filters
+from utilities.iterators import chunked
+
+UserModel = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Rebuild usernames, emails and tokens availability bloom filters from database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            dest='chunk_size',
+            default=10000,
+            help='Number of users loaded per query',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        fields = list(availability_filters)
+
+        started = perf_counter()
+        for bloom in availability_filters.values():
+            bloom.start_rebuild()
+
+        count = 0
+        queryset = UserModel._default_manager.values_list(*fields)
+        for rows in chunked(queryset.iterator(chunk_size=chunk_size), chunk_size):
+            self.add_rows(fields, rows)
+            count += len(rows)
+
+        for bloom in availability_filters.values():
+            bloom.finish_rebuild()
+
+        self.stdout.write(f'Rebuilt 🧮: {len(fields)} filters of {count} users in {perf_counter() - started:.2f}s')
+
+    @staticmethod
+    def add_rows(fields: list, rows: list) -> None:
+        for index, field in enumerate(fields):
+            availability_filters[field].add_to_rebuild(row[index] for row in rows)
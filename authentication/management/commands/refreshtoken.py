@@ -1,11 +1,26 @@
+import sys
+from functools import partial
+from secrets import token_hex
+from time import perf_counter
+
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+
+from authentication.availability import remember_users
+from authentication.models import TOKEN_CONSTRAINT
+from utilities.iterators import chunked
+from utilities.restful.authentication import invalidate_token
 
 UserModel = get_user_model()
 
 
 class Command(BaseCommand):
-    help = 'Get API token for a given user. and if user not have token generate one'
+    help = (
+        'Get API token for given users. and if user not have token generate one. '
+        'users selected by usernames, facility or file of usernames (one per line, "-" for stdin)'
+    )
+    max_retries = 3
 
     @staticmethod
     def create_user_token(username, reset_token):
@@ -16,7 +31,7 @@ class Command(BaseCommand):
         return user.token
 
     def add_arguments(self, parser):
-        parser.add_argument('username', type=str)
+        parser.add_argument('username', type=str, nargs='*')
 
         parser.add_argument(
             '-r',
@@ -26,14 +41,107 @@ class Command(BaseCommand):
             default=False,
             help='Reset existing User token and create a new one',
         )
+        parser.add_argument(
+            '-f',
+            '--facility',
+            dest='facility',
+            help='Refresh tokens of all staff in facility with this unique identifier',
+        )
+        parser.add_argument(
+            '--file',
+            dest='file',
+            help='Read usernames from file, one username per line. use "-" to read from stdin',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            dest='chunk_size',
+            default=1000,
+            help='Number of users updated per query',
+        )
 
-    def handle(self, *args, **options):
-        username = options['username']
-        reset_token = options['reset_token']
+    def iter_usernames(self, options):
+        yield from options['username']
+
+        if options['file']:
+            stream = sys.stdin if options['file'] == '-' else open(options['file'])
+            try:
+                for line in stream:
+                    username = line.strip()
+                    if username:
+                        yield username
+            finally:
+                if stream is not sys.stdin:
+                    stream.close()
+
+    def iter_user_chunks(self, options):
+        fields = 'pk', 'username', 'token', 'token_expires',
+        manager = UserModel._default_manager
 
+        for usernames in chunked(self.iter_usernames(options), options['chunk_size']):
+            users = list(manager.filter(username__in=usernames).only(*fields))
+            missing = set(usernames) - {user.username for user in users}
+            for username in missing:
+                self.stderr.write(f'Cannot create a token: user {username} does not exist')
+            yield users
+
+        if options['facility']:
+            queryset = manager.filter(facility_staff__facility__uid=options['facility']).only(*fields)
+            yield from chunked(queryset.iterator(chunk_size=options['chunk_size']), options['chunk_size'])
+
+    def save_tokens(self, users: list, chunk_size: int) -> None:
+        """
+        assign new tokens in memory and save them with one bulk update,
+        on token collision the unique constraint reject the chunk and it retried with new tokens
+        """
+        for attempt in range(self.max_retries):
+            token_expires = UserModel.get_token_expiry()
+            for user in users:
+                user.token = token_hex(25)
+                user.token_expires = token_expires
+            try:
+                with transaction.atomic():
+                    UserModel._default_manager.bulk_update(users, ['token', 'token_expires'], batch_size=chunk_size)
+                return
+            except IntegrityError as ex:
+                if TOKEN_CONSTRAINT not in str(ex) or attempt == self.max_retries - 1:
+                    raise
+
+    def handle_single(self, username, reset_token):
         try:
             token = self.create_user_token(username, reset_token)
         except UserModel.DoesNotExist:
             raise CommandError(f'Cannot create a token: user {username} does not exist')
 
         self.stdout.write(f'Generated 🥳: {token}')
+
+    def handle(self, *args, **options):
+        reset_token = options['reset_token']
+        chunk_size = options['chunk_size']
+
+        if len(options['username']) == 1 and not options['facility'] and not options['file']:
+            return self.handle_single(options['username'][0], reset_token)
+        if not options['username'] and not options['facility'] and not options['file']:
+            raise CommandError('Provide usernames, --facility or --file to select users')
+
+        started = perf_counter()
+        refreshed = 0
+        with transaction.atomic():
+            for users in self.iter_user_chunks(options):
+                outdated = [user for user in users if reset_token or not user.token or user.is_token_expired]
+                if outdated:
+                    # bulk update skip model signals, so clear cached sessions of old tokens manually
+                    old_tokens = [user.token for user in outdated if user.token]
+                    transaction.on_commit(partial(invalidate_token, *old_tokens))
+
+                    self.save_tokens(outdated, chunk_size)
+                    remember_users(*outdated, fields=['token'])
+                    refreshed += len(outdated)
+
+                for user in users:
+                    self.stdout.write(f'{user.username} {user.token}')
+
+        elapsed = perf_counter() - started
+        self.stdout.write(
+            f'Generated 🥳: {refreshed} tokens in {elapsed:.2f}s ({refreshed / elapsed if elapsed else 0:.0f} tokens/s)'
+        )
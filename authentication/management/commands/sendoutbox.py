@@ -0,0 +1,125 @@
+from time import sleep
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from authentication.models import OutboxEmail
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued outbox emails, one SMTP connection per batch'
+
+    def add_arguments(self, parser):
+        options = getattr(settings, 'EMAIL_OUTBOX', {})
+        parser.add_argument(
+            '-b',
+            '--batch-size',
+            type=int,
+            dest='batch_size',
+            default=options.get('BATCH_SIZE', 100),
+            help='Number of emails sent over one connection',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            default=False,
+            help='Keep running and poll the outbox every --interval seconds',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=options.get('POLL_INTERVAL', 5),
+            help='Seconds to wait when outbox is empty, used with --loop',
+        )
+        parser.add_argument(
+            '--stats',
+            action='store_true',
+            default=False,
+            help='Print outbox queue depth and exit',
+        )
+
+    def print_stats(self):
+        depth = OutboxEmail.objects.queue_depth()
+        self.stdout.write(f'Outbox 📬: {depth["pending"]} pending ({depth["due"]} due), {depth["failed"]} failed')
+
+    @staticmethod
+    def build_message(email: OutboxEmail, connection) -> EmailMultiAlternatives:
+        message = EmailMultiAlternatives(
+            subject=email.subject,
+            body=email.message,
+            from_email=email.from_email or None,
+            to=[email.recipient],
+            connection=connection,
+        )
+        if email.html_message:
+            message.attach_alternative(email.html_message, 'text/html')
+        return message
+
+    def send_batch(self, batch_size: int) -> tuple:
+        """
+        send one batch of due emails
+        :return: tuple of (sent, failed) counts
+        """
+        options = getattr(settings, 'EMAIL_OUTBOX', {})
+        max_attempts = options.get('MAX_ATTEMPTS', 5)
+        retry_delay = options.get('RETRY_DELAY', 60)
+
+        with transaction.atomic():
+            emails = OutboxEmail.objects.claim(batch_size)
+            if not emails:
+                return 0, 0
+
+            sent = failed = 0
+            connection = get_connection(fail_silently=False)
+            try:
+                connection.open()
+            except Exception as ex:
+                # mail server unreachable, delay the whole batch
+                for email in emails:
+                    email.mark_failed(ex, max_attempts, retry_delay)
+                failed = len(emails)
+            else:
+                try:
+                    for email in emails:
+                        try:
+                            self.build_message(email, connection).send()
+                        except Exception as ex:
+                            email.mark_failed(ex, max_attempts, retry_delay)
+                            failed += 1
+                        else:
+                            email.status = OutboxEmail.STATUS.sent
+                            email.sent_at = timezone.now()
+                            sent += 1
+                finally:
+                    connection.close()
+
+            OutboxEmail.objects.bulk_update(
+                emails, ['status', 'attempts', 'next_attempt', 'last_error', 'sent_at']
+            )
+        return sent, failed
+
+    def drain(self, batch_size: int) -> tuple:
+        sent = failed = 0
+        while True:
+            batch_sent, batch_failed = self.send_batch(batch_size)
+            if not batch_sent and not batch_failed:
+                return sent, failed
+            sent += batch_sent
+            failed += batch_failed
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            return self.print_stats()
+
+        while True:
+            sent, failed = self.drain(options['batch_size'])
+            if sent or failed or not options['loop']:
+                self.stdout.write(f'Sent 📨: {sent} emails, {failed} failed')
+            if not options['loop']:
+                break
+            sleep(options['interval'])
+
+        self.print_stats()
@@ -1,7 +1,16 @@
+from django.conf import settings
 from django.contrib import auth
 from django.contrib.auth.base_user import BaseUserManager
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import models
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
+from authentication import availability
+from authentication.activation import activation_codes
+from authentication.emails import email_templates
+from utilities.iterators import chunked
+
 
 class UserManager(BaseUserManager):
     use_in_migrations = True
@@ -68,20 +77,171 @@ class UserManager(BaseUserManager):
             )
         return self.none()
 
+    def send_bulk_email(
+        self,
+        users,
+        subject: str,
+        template,
+        context_fn,
+        chunk_size: int = None,
+        queue: bool = None,
+        message: str = None,
+        from_email: str = None,
+        fail_silently: bool = False,
+        auth_user: str = None,
+        auth_password: str = None,
+        connection=None,
+    ) -> dict:
+        """
+        render email for every user, then send them over one mail server connection per chunk.
+        when ``EMAIL_OUTBOX`` enabled all emails queued on outbox with one query
+        :param users: users to receive the email
+        :param subject: email subject
+        :param template: email template path
+        :param context_fn: callable take user and return its template context
+        :param chunk_size: number of emails sent per connection, default ``EMAIL_BULK_CHUNK_SIZE`` setting
+        :param queue: force queue emails on outbox or send them now, default ``EMAIL_OUTBOX`` setting.
+            emails sent now if custom mail server credentials or connection given, outbox use the default one
+        :param message: plain text body, default rendered from template
+        :param from_email: sender address, default ``DEFAULT_FROM_EMAIL`` setting
+        :param fail_silently: passed to mail server connection like ``send_mail``
+        :param auth_user: mail server username like ``send_mail``
+        :param auth_password: mail server password like ``send_mail``
+        :param connection: mail server connection used for all chunks like ``send_mail``
+        :return: dict of failed recipients email address and raised exception, one failure not abort the batch
+        """
+        from authentication.models import OutboxEmail
+
+        messages = []
+        compiled = email_templates.get(template)
+        for user in users:
+            context = context_fn(user)
+            html_message = compiled.html_template.render(context)
+            plain_message = message if message is not None else compiled.text_template.render(context)
+            messages.append((user.email, plain_message, html_message))
+
+        if auth_user is not None or auth_password is not None or connection is not None:
+            queue = False
+        elif queue is None:
+            queue = getattr(settings, 'EMAIL_OUTBOX', {}).get('ENABLED', False)
+        if queue:
+            # delivered later by "sendoutbox" command, so slow mail server never block the request
+            OutboxEmail.objects.bulk_create([
+                OutboxEmail(
+                    subject=subject,
+                    message=plain_message,
+                    recipient=recipient,
+                    html_message=html_message,
+                    from_email=from_email or '',
+                )
+                for recipient, plain_message, html_message in messages
+            ])
+            return {}
+
+        failures = {}
+        for chunk in chunked(messages, chunk_size or getattr(settings, 'EMAIL_BULK_CHUNK_SIZE', 100)):
+            chunk_connection = connection or get_connection(
+                username=auth_user,
+                password=auth_password,
+                fail_silently=fail_silently,
+            )
+            try:
+                chunk_connection.open()
+            except Exception as ex:
+                failures.update((entry[0], ex) for entry in chunk)
+                continue
+
+            try:
+                for recipient, plain_message, html_message in chunk:
+                    email = EmailMultiAlternatives(
+                        subject=subject,
+                        body=plain_message,
+                        from_email=from_email,
+                        to=[recipient],
+                        connection=chunk_connection,
+                    )
+                    email.attach_alternative(html_message, 'text/html')
+                    try:
+                        email.send(fail_silently=fail_silently)
+                    except Exception as ex:
+                        failures[recipient] = ex
+            finally:
+                # given connection left for the caller to close, like ``send_mail``
+                if connection is None:
+                    chunk_connection.close()
+        return failures
+
+    def send_activation_emails(self, users, queue: bool = None) -> dict:
+        """
+        issue activation codes of all users with one redis round trip and send them activation emails,
+        outstanding codes of these users are invalidated
+        :return: dict of failed recipients, see ``send_bulk_email``
+        """
+        codes = activation_codes.issue_many(users)
+
+        return self.send_bulk_email(
+            users,
+            subject='Welcome on board',
+            template='email/account_activation.html',
+            context_fn=lambda user: {
+                'code': codes[user.pk],
+                'name': user.full_name if user.full_name else user.username
+            },
+            from_email='verification@observer.com',
+            queue=queue,
+        )
+
+    def check_availability(self, field: str, values) -> dict:
+        """
+        check many values of unique field with one query, values filtered first by availability
+        bloom filter (when enabled) so definitely available values never reach database
+        :param field: one of username, email or token
+        :param values: values to check
+        :return: dict of value and True if it is available, empty values are always available
+        """
+        result = {value: True for value in values}
+        candidates = availability.maybe_taken(field, [value for value in result if value])
+        if candidates:
+            taken = self.filter(**{f'{field}__in': candidates}).values_list(field, flat=True)
+            result.update((value, False) for value in taken)
+        return result
+
+    def check_usernames_availability(self, usernames) -> dict:
+        return self.check_availability('username', usernames)
+
+    def check_emails_availability(self, emails) -> dict:
+        return self.check_availability('email', emails)
+
+    def check_tokens_availability(self, tokens) -> dict:
+        return self.check_availability('token', tokens)
+
     def check_username_availability(self, username: str) -> bool:
-        if username:
-            qs = self.filter(username=username)
-            return not qs.exists()
-        return True
+        return self.check_usernames_availability([username])[username]
 
     def check_email_availability(self, email: str) -> bool:
-        if email:
-            qs = self.filter(email=email)
-            return not qs.exists()
-        return True
+        return self.check_emails_availability([email])[email]
 
     def check_token_availability(self, token: str) -> bool:
-        if token:
-            qs = self.filter(token=token)
-            return not qs.exists()
-        return True
+        return self.check_tokens_availability([token])[token]
+
+
+class OutboxEmailManager(models.Manager):
+    def due(self):
+        return self.filter(status=self.model.STATUS.pending, next_attempt__lte=timezone.now())
+
+    def queue_depth(self) -> dict:
+        """
+        :return: count of pending emails, and how many of them are due now
+        """
+        return {
+            'pending': self.filter(status=self.model.STATUS.pending).count(),
+            'due': self.due().count(),
+            'failed': self.filter(status=self.model.STATUS.failed).count(),
+        }
+
+    def claim(self, batch_size: int) -> list:
+        """
+        lock due emails, locked rows skipped by other workers
+        must be called inside transaction
+        """
+        return list(self.due().select_for_update(skip_locked=True).order_by('next_attempt')[:batch_size])
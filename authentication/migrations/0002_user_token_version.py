@@ -0,0 +1,18 @@
+# Generated by Django 3.1.5 on 2026-10-18 06:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='token_version',
+            field=models.PositiveIntegerField(default=0, help_text='Signed API tokens issued with older version are rejected.', verbose_name='token version'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.5 on 2026-10-18 06:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_user_token_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='token_expires',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='API token rejected after this date, empty mean never expire.', null=True, verbose_name='token expiration date'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.1.5 on 2026-10-18 06:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0003_user_token_expires'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(condition=models.Q(_negated=True, token=''), fields=('token',), name='unique_non_empty_token'),
+        ),
+    ]
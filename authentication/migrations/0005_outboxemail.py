@@ -0,0 +1,41 @@
+# Generated by Django 3.1.5 on 2026-10-18 06:13
+
+from django.db import migrations, models
+import django.utils.timezone
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_user_unique_token'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEmail',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('subject', models.CharField(max_length=255)),
+                ('message', models.TextField(blank=True, verbose_name='plain text body')),
+                ('html_message', models.TextField(blank=True, verbose_name='html body')),
+                ('from_email', models.CharField(blank=True, help_text='Empty mean use DEFAULT_FROM_EMAIL.', max_length=255)),
+                ('recipient', models.EmailField(max_length=254)),
+                ('status', model_utils.fields.StatusField(choices=[('pending', 'pending'), ('sent', 'sent'), ('failed', 'failed')], db_index=True, default='pending', max_length=100, no_check_for_status=True)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('next_attempt', models.DateTimeField(default=django.utils.timezone.now, help_text='Email not delivered before this date.')),
+                ('last_error', models.TextField(blank=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'outbox email',
+                'verbose_name_plural': 'outbox emails',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='outboxemail',
+            index=models.Index(fields=['status', 'next_attempt'], name='outbox_email_due'),
+        ),
+    ]
@@ -1,18 +1,24 @@
+from datetime import timedelta
 from secrets import token_hex
-from uuid import uuid4
 
+from django.conf import settings
 from django.contrib.auth.base_user import AbstractBaseUser
 from django.contrib.auth.models import PermissionsMixin, Group as BaseGroup
-from django.core.cache import cache
-from django.core.mail import send_mail
 from django.core.validators import RegexValidator
-from django.db import models
-from django.template.loader import render_to_string
+from django.db import IntegrityError, models, transaction
+from django.db.models import Q, UniqueConstraint
 from django.utils import timezone
-from django.utils.html import strip_tags
 from django.utils.translation import ugettext as _
+from model_utils import Choices
+from model_utils.fields import StatusField
+from model_utils.models import TimeStampedModel
 
-from authentication.managers import UserManager
+from authentication.managers import OutboxEmailManager, UserManager
+from authentication.permissions import PermissionSet, permission_sets
+from utilities.restful.authentication import revoke_token
+from utilities.restful.tokens import SignedToken
+
+TOKEN_CONSTRAINT = 'unique_non_empty_token'
 
 
 class User(AbstractBaseUser, PermissionsMixin):
@@ -48,6 +54,18 @@ class User(AbstractBaseUser, PermissionsMixin):
     last_name = models.CharField('last name', max_length=90, blank=True)
 
     token = models.CharField("auth token", max_length=50, db_index=True, blank=True)
+    token_expires = models.DateTimeField(
+        'token expiration date',
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text='API token rejected after this date, empty mean never expire.'
+    )
+    token_version = models.PositiveIntegerField(
+        'token version',
+        default=0,
+        help_text='Signed API tokens issued with older version are rejected.'
+    )
     is_staff = models.BooleanField(
         'staff status',
         default=False,
@@ -76,6 +94,13 @@ class User(AbstractBaseUser, PermissionsMixin):
         db_table = 'auth_user'
         verbose_name = _('user')
         verbose_name_plural = _('authentication Accounts')
+        constraints = [
+            UniqueConstraint(
+                fields=['token'],
+                condition=~Q(token=''),
+                name=TOKEN_CONSTRAINT,
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.full_name if self.full_name else str(self.username)
@@ -89,6 +114,22 @@ class User(AbstractBaseUser, PermissionsMixin):
         full_name = '%s %s' % (self.first_name, self.last_name)
         return full_name.strip()
 
+    @property
+    def is_token_expired(self) -> bool:
+        return self.token_expires is not None and self.token_expires <= timezone.now()
+
+    @property
+    def permission_set(self) -> PermissionSet:
+        """
+        cached django permissions and facility role of user, loaded once per instance.
+        django permissions backend cache primed too, so ``has_perm`` never query database
+        """
+        if '_permission_set' not in self.__dict__:
+            self._permission_set = permission_sets.get(self)
+            if not self.is_superuser:
+                self._perm_cache = set(self._permission_set.permissions)
+        return self._permission_set
+
     def update_last_login(self, commit: bool = True) -> None:
         """
         update last_login field with now datetime and save update
@@ -97,65 +138,149 @@ class User(AbstractBaseUser, PermissionsMixin):
         """
         self.last_login = timezone.now()
         if commit:
-            self.save()
+            self.save(update_fields=['last_login'])
+
+    @staticmethod
+    def get_token_expiry():
+        """
+        :return: expiration date for token generated now, or None if tokens never expire
+        """
+        lifetime = settings.AUTH_TOKEN_LIFETIME
+        return timezone.now() + timedelta(seconds=lifetime) if lifetime else None
 
     def generate_token(self, commit: bool = True) -> str:
         """
-        generate API token key and save it for this instance
+        generate API token key and save it for this instance,
+        tokens uniqueness guaranteed by database unique constraint
         :parameter commit: if i want to override save behavior
         :return: string contain the new generated token key
         """
+        # keep old token to invalidate its cached session after save
+        if self.token and not hasattr(self, '_previous_token'):
+            self._previous_token = self.token
         self.token = token_hex(25)
-        if User.objects.check_token_availability(self.token):
-            if commit:
-                self.save()
-            return self.token
-        else:
-            return self.generate_token(commit=commit)
+        self.token_expires = self.get_token_expiry()
+        if commit:
+            try:
+                with transaction.atomic():
+                    # only token fields, so cached request users never write back stale fields
+                    # and token refresh not counted as roster change
+                    self.save(update_fields=['token', 'token_expires'] if self.pk else None)
+            except IntegrityError as ex:
+                if TOKEN_CONSTRAINT not in str(ex):
+                    raise
+                # token collision, retry with another one
+                return self.generate_token(commit=commit)
+        return self.token
 
-    def send_email(self, subject: str, template, context: dict, **kwargs) -> None:
+    def revoke_token(self, commit: bool = True) -> None:
         """
-        send email to user based on user email address.
-        :param subject: email subject
-        :param template: email template path
-        :param context: dict object represent template context
+        revoke current API token and add it to revoked tokens denylist
+        :parameter commit: if i want to override save behavior
+        """
+        if self.token:
+            revoke_token(self.token)
+        self.token = ''
+        self.token_expires = None
+        if commit:
+            # request user may be cached snapshot, never write back its other fields
+            self.save(update_fields=['token', 'token_expires'])
+
+    def generate_signed_token(self) -> str:
         """
-        html_message = render_to_string(template_name=template, context=context)
-        plain_message = kwargs.pop('message') if 'message' in kwargs else strip_tags(html_message)
-        send_mail(
-            subject=subject,
-            message=plain_message,
-            recipient_list=[self.email],
-            html_message=html_message,
-            **kwargs
-        )
+        generate stateless signed API token, verified without database lookup
+        :return: string contain the signed token
+        """
+        return SignedToken.make(self.pk, self.token_version)
 
-    def send_activation_email(self) -> None:
+    def revoke_signed_tokens(self, commit: bool = True) -> None:
         """
-        set user information in cash and send activation email to user
+        reject all signed tokens issued for this user before now
+        :parameter commit: if i want to override save behavior
         """
-        cache_id = uuid4()
-        user_obj = {
+        self.token_version += 1
+        if commit:
+            self.save(update_fields=['token_version'])
+
+    @property
+    def activation_data(self) -> dict:
+        """
+        user information saved with activation code
+        """
+        return {
             'id': self.id,
             'username': self.username,
             'first_name': self.first_name,
             'last_name': self.last_name,
             'email': self.email
         }
-        # save user data on cache and set valid timeout to 1 day
-        cache.set(cache_id, user_obj, timeout=86400)
-
-        # send email
-        self.send_email(
-            subject='Welcome on board',
-            template='email/account_activation.html',
-            context={
-                'code': cache_id,
-                'name': self.full_name if self.full_name else self.username
-            },
-            message='',
-            from_email='verification@observer.com'
-        )
+
+    def send_email(self, subject: str, template, context: dict, **kwargs) -> None:
+        """
+        send email to user based on user email address.
+        when ``EMAIL_OUTBOX`` enabled the email queued on outbox instead of sending it inline
+        :param subject: email subject
+        :param template: email template path
+        :param context: dict object represent template context
+        :param kwargs: ``send_mail`` options (message, from_email, fail_silently, auth_user, auth_password,
+            connection) see ``UserManager.send_bulk_email``
+        """
+        failures = self.__class__.objects.send_bulk_email([self], subject, template, lambda user: context, **kwargs)
+        if failures:
+            raise failures[self.email]
+
+    def send_activation_email(self) -> None:
+        """
+        issue new activation code and send activation email to user
+        """
+        failures = self.__class__.objects.send_activation_emails([self])
+        if failures:
+            raise failures[self.email]
+
+
+class OutboxEmail(TimeStampedModel):
+    STATUS = Choices(
+        'pending',
+        'sent',
+        'failed',
+    )
+
+    subject = models.CharField(max_length=255)
+    message = models.TextField('plain text body', blank=True)
+    html_message = models.TextField('html body', blank=True)
+    from_email = models.CharField(max_length=255, blank=True, help_text='Empty mean use DEFAULT_FROM_EMAIL.')
+    recipient = models.EmailField()
+    status = StatusField(db_index=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt = models.DateTimeField(default=timezone.now, help_text='Email not delivered before this date.')
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    objects = OutboxEmailManager()
+
+    class Meta:
+        verbose_name = _('outbox email')
+        verbose_name_plural = _('outbox emails')
+        indexes = [
+            models.Index(fields=['status', 'next_attempt'], name='outbox_email_due'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.subject} <{self.recipient}>'
+
+    def mark_failed(self, error: Exception, max_attempts: int, retry_delay: int) -> None:
+        """
+        record delivery failure and schedule next attempt with exponential backoff
+        :param error: raised exception while sending
+        :param max_attempts: give up after this number of attempts
+        :param retry_delay: seconds to wait after first failure, doubled on every failure
+        """
+        self.attempts += 1
+        self.last_error = f'{error.__class__.__name__}: {error}'
+        if self.attempts >= max_attempts:
+            self.status = self.STATUS.failed
+        else:
+            self.next_attempt = timezone.now() + timedelta(seconds=retry_delay * 2 ** (self.attempts - 1))
 
 
 class Group(BaseGroup):
@@ -0,0 +1,83 @@
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.contrib.auth.models import Permission
+from django.db.models import Q
+
+from utilities.caching import TieredCache
+
+
+class PermissionSet(NamedTuple):
+    """
+    everything needed to authorize user requests, compiled once and cached
+    """
+    user_id: int
+    is_superuser: bool
+    permissions: frozenset
+    facility_id: Optional[int]
+    is_chief: bool
+
+    @property
+    def is_facility_staff(self) -> bool:
+        return self.facility_id is not None
+
+    def has_perm(self, perm: str) -> bool:
+        return self.is_superuser or perm in self.permissions
+
+    def has_perms(self, perms) -> bool:
+        return all(self.has_perm(perm) for perm in perms)
+
+
+class PermissionRegistry:
+    """
+    Resolve users compiled permission set through local and redis cache,
+    django permissions (user and groups) and facility role loaded with two queries on cache miss.
+    cache invalidated by ``authentication.signals`` and ``corporations.signals``, and again on commit.
+    """
+
+    def __init__(self):
+        options = getattr(settings, 'PERMISSION_CACHE', {})
+        self.cache = TieredCache(
+            prefix='auth:permissions',
+            timeout=options.get('TIMEOUT', 3600),
+            local_size=options.get('LOCAL_SIZE', 1024),
+            local_timeout=options.get('LOCAL_TIMEOUT', 30),
+        )
+
+    @staticmethod
+    def compile(user) -> PermissionSet:
+        permissions = Permission.objects.filter(
+            Q(user=user) | Q(group__user=user)
+        ).values_list('content_type__app_label', 'codename').distinct()
+        staff = user.__class__._default_manager.filter(pk=user.pk).values_list(
+            'facility_staff__facility_id', 'facility_staff__is_chief'
+        ).first() or (None, None)
+
+        return PermissionSet(
+            user_id=user.pk,
+            is_superuser=user.is_superuser,
+            permissions=frozenset(f'{app_label}.{codename}' for app_label, codename in permissions),
+            facility_id=staff[0],
+            is_chief=bool(staff[1]),
+        )
+
+    def get(self, user) -> PermissionSet:
+        """
+        :param user: saved user instance
+        :return: user compiled permission set
+        """
+        values = self.cache.get(user.pk)
+        if values is not None:
+            return PermissionSet(*values)
+
+        permission_set = self.compile(user)
+        self.cache.set(user.pk, tuple(permission_set))
+        return permission_set
+
+    def invalidate(self, *user_ids: int) -> None:
+        user_ids = [user_id for user_id in user_ids if user_id]
+        if user_ids:
+            self.cache.invalidate(*user_ids)
+
+
+permission_sets = PermissionRegistry()
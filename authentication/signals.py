@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from authentication.activation import activation_codes
+from authentication.models import Group as ProxyGroup
+from authentication.availability import remember_users
+from authentication.permissions import permission_sets
+from utilities.restful.authentication import invalidate_token, invalidate_user
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_token_after_save_user(sender, instance, **kwargs):
+    # any change (token regenerated, deactivated, ...) must not be served from cache
+    invalidate_token(instance.token, instance.__dict__.pop('_previous_token', None))
+    invalidate_user(instance.pk)
+    permission_sets.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def remember_user_after_save(sender, instance, **kwargs):
+    # bloom filter values never removed, deleted or changed values stay as false positives until rebuild
+    remember_users(instance)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_token_after_delete_user(sender, instance, **kwargs):
+    invalidate_token(instance.token)
+    invalidate_user(instance.pk)
+    permission_sets.invalidate(instance.pk)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def revoke_activation_code_after_delete_user(sender, instance, **kwargs):
+    if not instance.is_verified:
+        activation_codes.revoke_user(instance.pk)
+
+
+def users_of_groups(group_ids) -> list:
+    return list(get_user_model()._default_manager.filter(groups__in=group_ids).values_list('pk', flat=True).distinct())
+
+
+@receiver(m2m_changed, sender=get_user_model().groups.through)
+@receiver(m2m_changed, sender=get_user_model().user_permissions.through)
+def invalidate_permissions_after_change_user_groups(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            permission_sets.invalidate(instance.pk)
+    elif action in ('post_add', 'post_remove'):
+        # group.user_set or permission.user_set changed
+        permission_sets.invalidate(*pk_set)
+    elif action == 'pre_clear':
+        permission_sets.invalidate(*instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_permissions_after_change_group_permissions(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse and action in ('post_add', 'post_remove', 'post_clear'):
+        permission_sets.invalidate(*users_of_groups([instance.pk]))
+    elif reverse and action in ('post_add', 'post_remove'):
+        # permission.group_set changed
+        permission_sets.invalidate(*users_of_groups(pk_set))
+    elif reverse and action == 'pre_clear':
+        permission_sets.invalidate(*users_of_groups(instance.group_set.values_list('pk', flat=True)))
+
+
+@receiver(pre_delete, sender=Group)
+@receiver(pre_delete, sender=ProxyGroup)
+def invalidate_permissions_before_delete_group(sender, instance, **kwargs):
+    permission_sets.invalidate(*users_of_groups([instance.pk]))
@@ -0,0 +1,63 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from model_bakery import baker
+
+from authentication.activation import activation_codes
+
+UserModel = get_user_model()
+
+
+class TestActivationCodeStore(TestCase):
+    def setUp(self) -> None:
+        self.user = baker.make(
+            'authentication.User',
+            username='activation_user',
+            email='activation@observer.io',
+            first_name='Activation',
+        )
+        self.code = activation_codes.issue(self.user)
+
+    def test_issue_code(self):
+        self.assertEqual(activation_codes.get(self.code), {
+            'id': self.user.id,
+            'username': 'activation_user',
+            'first_name': 'Activation',
+            'last_name': '',
+            'email': 'activation@observer.io',
+        })
+        self.assertEqual(activation_codes.get_user_code(self.user.id), self.code)
+
+        # saved as compact json array
+        value = activation_codes.connection.get(activation_codes.code_key(self.code))
+        self.assertEqual(value.decode(), f'[{self.user.id},"activation_user","Activation","","activation@observer.io"]')
+
+    def test_new_code_invalidate_old_one(self):
+        new_code = activation_codes.issue(self.user)
+        self.assertNotEqual(new_code, self.code)
+        self.assertIsNone(activation_codes.get(self.code))
+        self.assertEqual(activation_codes.get(new_code)['id'], self.user.id)
+        self.assertEqual(activation_codes.get_user_code(self.user.id), new_code)
+
+    def test_issue_many(self):
+        users = baker.make('authentication.User', _quantity=3)
+        codes = activation_codes.issue_many(users + [self.user])
+
+        self.assertEqual(len(set(codes.values())), 4)
+        self.assertIsNone(activation_codes.get(self.code))
+        for user in users:
+            self.assertEqual(activation_codes.get(codes[user.pk])['username'], user.username)
+            activation_codes.revoke_user(user.pk)
+
+    def test_revoke_old_code_keep_user_index(self):
+        new_code = activation_codes.issue(self.user)
+        activation_codes.revoke(self.code, self.user.id)
+        self.assertEqual(activation_codes.get_user_code(self.user.id), new_code)
+
+    def test_revoke_after_delete_user(self):
+        self.user.delete()
+        self.assertIsNone(activation_codes.get(self.code))
+        self.assertIsNone(activation_codes.get_user_code(self.user.id))
+
+    def tearDown(self) -> None:
+        if self.user.pk:
+            activation_codes.revoke_user(self.user.pk)
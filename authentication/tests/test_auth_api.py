@@ -1,19 +1,27 @@
 from uuid import uuid4
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.cache import cache
 from django.shortcuts import reverse
+from django.test import override_settings
 from django.urls import NoReverseMatch
 from model_bakery import baker
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from authentication.activation import activation_codes
+from corporations.registry import facilities
+from utilities.caching import digest
+from utilities.restful.authentication import principal_cache
+from utilities.restful.throttling import SlidingWindowThrottle
+
 User = get_user_model()
 
 
 class FacilityStaffAuthViewSet(APITestCase):
     def setUp(self) -> None:
         super().setUp()
+        SlidingWindowThrottle.reset_history()
         self.employee = baker.make(
             'corporations.Employee',
             user__username='test_user',
@@ -45,6 +53,154 @@ class FacilityStaffAuthViewSet(APITestCase):
         self.assertEqual(response.data['username'], self.employee.user.username)
         self.assertEqual(response.data['full_name'], self.employee.user.full_name)
 
+    def test_login_with_sparse_fieldset(self):
+        api_url = reverse('auth:facility_staff-login')
+        data = {
+            'facility': 'facility-test',
+            'username': 'test_user',
+            'password': '123456789'
+        }
+
+        response = self.client.post(f'{api_url}?fields=token', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'token': self.employee.user.token})
+
+    def test_login_upgrade_password_hash(self):
+        user = self.employee.user
+        with override_settings(PASSWORD_HASHER_ITERATIONS=1000):
+            user.set_password('123456789')
+            user.save()
+
+        api_url = reverse('auth:facility_staff-login')
+        data = {
+            'facility': 'facility-test',
+            'username': 'test_user',
+            'password': '123456789'
+        }
+        with override_settings(PASSWORD_HASHER_ITERATIONS=2000):
+            response = self.client.post(api_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$2000$'))
+
+    def test_login_with_one_query(self):
+        api_url = reverse('auth:facility_staff-login')
+        data = {
+            'facility': 'facility-test',
+            'username': 'test_user',
+            'password': '123456789'
+        }
+
+        # facility resolved from facilities registry cache
+        facilities.get('facility-test')
+        with self.assertNumQueries(1):
+            response = self.client.post(api_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_login_with_wrong_facility_and_username(self):
+        api_url = reverse('auth:facility_staff-login')
+        data = {
+            'facility': 'wrong-facility',
+            'username': 'wrong_user',
+            'password': '123456789'
+        }
+
+        response = self.client.post(api_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('This facility no longer exists', response.data['facility'][0])
+        self.assertIn('This user no longer exists', response.data['username'][0])
+
+    def test_login_with_not_associated_facility(self):
+        baker.make('corporations.Facility', uid='another-test', is_active=True)
+        api_url = reverse('auth:facility_staff-login')
+        data = {
+            'facility': 'another-test',
+            'username': 'test_user',
+            'password': '123456789'
+        }
+
+        response = self.client.post(api_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('You are not associated to this facility', response.data[0])
+
+    def test_login_with_not_employee_user(self):
+        baker.make('authentication.User', username='not_employee')
+        api_url = reverse('auth:facility_staff-login')
+        data = {
+            'facility': 'facility-test',
+            'username': 'not_employee',
+            'password': '123456789'
+        }
+
+        response = self.client.post(api_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('you not have right permissions', response.data['username'][0])
+
+    @override_settings(AUTH_SIGNED_TOKENS=True)
+    def test_login_with_signed_token(self):
+        api_url = reverse('auth:facility_staff-login')
+        data = {
+            'facility': 'facility-test',
+            'username': 'test_user',
+            'password': '123456789'
+        }
+
+        response = self.client.post(api_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.data['token'], self.employee.user.token)
+
+        # signed token work side by side with the database token
+        password_url = reverse('auth:facility_staff-change-password')
+        for token in (response.data['token'], self.employee.user.token):
+            self.client.credentials(HTTP_API_VERSION='1.1.0.0', HTTP_AUTHORIZATION=f'Token {token}')
+            response = self.client.put(password_url, {'password': '123456789'}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_async_login(self):
+        api_url = reverse('auth:facility_staff-async-login')
+        data = {
+            'facility': 'facility-test',
+            'username': 'test_user',
+            'password': '123456789'
+        }
+
+        response = self.client.post(api_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.json()['status'])
+        self.assertEqual(response.json()['result']['token'], self.employee.user.token)
+
+        data['password'] = 'wrong_password'
+        response = self.client.post(api_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(response.json()['status'])
+        self.assertIn('You have entered wrong credentials', response.json()['error'][0])
+
+    def test_login_throttled_by_username(self):
+        api_url = reverse('auth:facility_staff-login')
+        data = {
+            'facility': 'facility-test',
+            'username': 'test_user',
+            'password': 'wrong_password'
+        }
+        rates = {'login_ip': '100/min', 'login_facility': '100/min', 'login_username': '2/min'}
+
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates}):
+            for _ in range(2):
+                response = self.client.post(api_url, data, format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+            # throttled before any query or password hashing
+            with self.assertNumQueries(0):
+                response = self.client.post(api_url, data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertIn('Retry-After', response)
+            self.assertFalse(response.json()['status'])
+            self.assertIn('Request was throttled', response.json()['error'])
+
+            response = self.client.post(reverse('auth:facility_staff-async-login'), data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertIn('Retry-After', response)
+
     def test_login_with_wrong_method(self):
         api_url = reverse('auth:facility_staff-login')
         data = {
@@ -56,6 +212,41 @@ class FacilityStaffAuthViewSet(APITestCase):
         response = self.client.put(api_url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
+    def test_logout(self):
+        token = self.employee.user.token
+        self.client.credentials(HTTP_API_VERSION='1.1.0.0', HTTP_AUTHORIZATION=f'Token {token}')
+
+        api_url = reverse('auth:facility_staff-logout')
+        response = self.client.post(api_url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.employee.user.refresh_from_db()
+        self.assertEqual(self.employee.user.token, '')
+
+        response = self.client.post(api_url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_keep_concurrent_changes(self):
+        user = self.employee.user
+        self.client.credentials(HTTP_API_VERSION='1.1.0.0', HTTP_AUTHORIZATION=f'Token {user.token}')
+        api_url = reverse('auth:facility_staff-change-password')
+        self.client.put(api_url, {'password': 'test_password'}, format='json')
+        # same password rejected, checked by password hash loaded from database not from cache
+        response = self.client.put(api_url, {'password': 'test_password'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        user.refresh_from_db()
+        cached = principal_cache.get(digest(user.token))
+        self.assertNotIn(user.password, cached)
+        self.assertNotIn(user.token, cached)
+
+        # changed without signals, so request user still served from cache
+        User.objects.filter(pk=user.pk).update(email='changed@observer.io', is_active=False)
+        response = self.client.post(reverse('auth:facility_staff-logout'), format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertEqual(user.email, 'changed@observer.io')
+        self.assertFalse(user.is_active)
+        self.assertTrue(user.check_password('test_password'))
+
     def test_change_password(self):
         user = self.employee.user
         self.assertTrue(user.check_password('123456789'))
@@ -109,6 +300,7 @@ class FacilityStaffAuthViewSet(APITestCase):
 class TestUsersViewSet(APITestCase):
     def setUp(self) -> None:
         super().setUp()
+        SlidingWindowThrottle.reset_history()
         self.employee = baker.make(
             'corporations.Employee',
             user__username='test_user',
@@ -121,7 +313,7 @@ class TestUsersViewSet(APITestCase):
 
         # related to activate account API
         self.uuid_code = uuid4()
-        cache.set(self.uuid_code, {
+        activation_codes.save(self.uuid_code, {
             'id': self.employee.user.id,
             'username': self.employee.user.username,
             'email': self.employee.user.email,
@@ -162,7 +354,7 @@ class TestUsersViewSet(APITestCase):
         self.assertTrue(all(i in response.data.keys() for i in ['last_name', 'password']))
 
     def test_activate_account_with_wrong_cached_data(self):
-        cache.set(self.uuid_code, {
+        activation_codes.save(self.uuid_code, {
             'id': 3,
             'username': self.employee.user.username,
             'email': self.employee.user.email,
@@ -236,6 +428,10 @@ class TestUsersViewSet(APITestCase):
         self.assertTrue(self.employee.user.is_verified)
         self.assertIsNotNone(self.employee.user.token)
 
+        # activation code used only once
+        response = self.client.get(api_url, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_activate_account_success_with_username(self):
         data = {
             'username': 'username3',
@@ -255,7 +451,7 @@ class TestUsersViewSet(APITestCase):
         self.assertIsNotNone(self.employee.user.token)
 
     def tearDown(self) -> None:
-        cache.delete(self.uuid_code)
+        activation_codes.revoke(self.uuid_code, self.employee.user.id)
         User.objects.all().delete()
         facility = self.employee.facility
         self.employee.delete()
@@ -0,0 +1,86 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from model_bakery import baker
+
+from authentication.availability import availability_filters
+from utilities.bloom import BloomFilter
+
+UserModel = get_user_model()
+
+
+class TestBloomFilter(TestCase):
+    def setUp(self) -> None:
+        self.bloom = BloomFilter('bloom:test', capacity=1000, error_rate=0.01)
+        self.bloom.clear()
+
+    def test_not_ready_before_rebuild(self):
+        self.bloom.add('first')
+        self.assertIsNone(self.bloom.contains(['first']))
+
+    def test_contains(self):
+        self.bloom.start_rebuild()
+        self.bloom.add_to_rebuild(['first'])
+        # added while rebuilding, kept after rebuild finish
+        self.bloom.add('second')
+        self.bloom.finish_rebuild()
+
+        self.assertEqual(self.bloom.contains(['first', 'second', 'third']), {
+            'first': True,
+            'second': True,
+            'third': False,
+        })
+
+    def test_rebuild_keep_recent_additions(self):
+        self.bloom.start_rebuild()
+        self.bloom.finish_rebuild()
+
+        # saved by transaction not visible to next rebuild snapshot
+        self.bloom.add('uncommitted')
+        self.bloom.start_rebuild()
+        self.bloom.finish_rebuild()
+        self.assertTrue(self.bloom.contains(['uncommitted'])['uncommitted'])
+
+        # dropped once a whole rebuild passed without it
+        self.bloom.start_rebuild()
+        self.bloom.finish_rebuild()
+        self.assertFalse(self.bloom.contains(['uncommitted'])['uncommitted'])
+
+    def tearDown(self) -> None:
+        self.bloom.clear()
+
+
+class TestAvailabilityChecks(TestCase):
+    def setUp(self) -> None:
+        self.user = baker.make('authentication.User', username='taken_name', email='taken@observer.io')
+
+    def test_check_many_values_with_one_query(self):
+        with self.assertNumQueries(1):
+            result = UserModel.objects.check_usernames_availability(['taken_name', 'free_name', ''])
+        self.assertEqual(result, {'taken_name': False, 'free_name': True, '': True})
+
+        self.assertFalse(UserModel.objects.check_email_availability('taken@observer.io'))
+        self.assertTrue(UserModel.objects.check_email_availability('free@observer.io'))
+        self.assertTrue(UserModel.objects.check_token_availability(''))
+
+    @override_settings(AVAILABILITY_BLOOM_FILTER={'ENABLED': True})
+    def test_bloom_filter_skip_database(self):
+        out = StringIO()
+        call_command('rebuildavailability', stdout=out)
+        self.assertIn('Rebuilt 🧮: 3 filters of 1 users', out.getvalue())
+
+        with self.assertNumQueries(0):
+            self.assertTrue(UserModel.objects.check_username_availability('free_name'))
+        with self.assertNumQueries(1):
+            self.assertFalse(UserModel.objects.check_username_availability('taken_name'))
+
+        # new users added to filters on save
+        baker.make('authentication.User', username='new_name')
+        with self.assertNumQueries(1):
+            self.assertFalse(UserModel.objects.check_username_availability('new_name'))
+
+    def tearDown(self) -> None:
+        for bloom in availability_filters.values():
+            bloom.clear()
@@ -0,0 +1,89 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from model_bakery import baker
+
+UserModel = get_user_model()
+
+
+class TestSweepTokensCommand(TestCase):
+    def setUp(self) -> None:
+        self.expired_users = baker.make(
+            'authentication.User',
+            token=baker.seq('expired_token_'),
+            token_expires=timezone.now() - timezone.timedelta(days=1),
+            _quantity=3
+        )
+        self.valid_user = baker.make(
+            'authentication.User',
+            token='valid_token',
+            token_expires=timezone.now() + timezone.timedelta(days=1)
+        )
+
+    def test_sweep_expired_tokens(self):
+        out = StringIO()
+        call_command('sweeptokens', batch_size=2, stdout=out)
+
+        self.assertIn('Swept 3 expired tokens', out.getvalue())
+        self.assertFalse(UserModel.objects.filter(token__startswith='expired_token_').exists())
+        self.valid_user.refresh_from_db()
+        self.assertEqual(self.valid_user.token, 'valid_token')
+
+    def tearDown(self) -> None:
+        UserModel.objects.all().delete()
+
+
+class TestRefreshTokenCommand(TestCase):
+    def setUp(self) -> None:
+        self.employees = baker.make(
+            'corporations.Employee',
+            user__username=baker.seq('staff_user_'),
+            user__email=baker.seq('staff', suffix='@observer.io'),
+            facility=baker.make('corporations.Facility', uid='refresh-test'),
+            _quantity=3
+        )
+        self.user = baker.make('authentication.User', username='single_user', token='old_token')
+
+    def test_refresh_single_user(self):
+        out = StringIO()
+        call_command('refreshtoken', 'single_user', stdout=out)
+        self.assertIn('Generated 🥳: old_token', out.getvalue())
+
+        call_command('refreshtoken', 'single_user', reset_token=True, stdout=out)
+        self.user.refresh_from_db()
+        self.assertNotEqual(self.user.token, 'old_token')
+        self.assertIn(f'Generated 🥳: {self.user.token}', out.getvalue())
+
+    def test_refresh_facility_users(self):
+        out = StringIO()
+        call_command('refreshtoken', facility='refresh-test', chunk_size=2, stdout=out)
+
+        tokens = set(UserModel.objects.filter(facility_staff__facility__uid='refresh-test').values_list('token', flat=True))
+        self.assertEqual(len(tokens), 3)
+        self.assertNotIn('', tokens)
+        self.assertIn('Generated 🥳: 3 tokens', out.getvalue())
+
+    def test_refresh_many_usernames(self):
+        out, err = StringIO(), StringIO()
+        call_command('refreshtoken', 'single_user', 'staff_user_1', 'unknown_user', reset_token=True, stdout=out, stderr=err)
+
+        self.user.refresh_from_db()
+        self.assertNotEqual(self.user.token, 'old_token')
+        self.assertIsNotNone(self.user.token_expires)
+        self.assertIn(f'single_user {self.user.token}', out.getvalue())
+        self.assertIn('user unknown_user does not exist', err.getvalue())
+
+    def tearDown(self) -> None:
+        UserModel.objects.all().delete()
+
+
+class TestCalibrateHashersCommand(SimpleTestCase):
+    @override_settings(PASSWORD_HASHER_ITERATIONS=1000)
+    def test_calibrate_hashers(self):
+        out = StringIO()
+        call_command('calibratehashers', target=10, samples=1, stdout=out)
+        self.assertIn('TunablePBKDF2PasswordHasher (pbkdf2_sha256) [default]', out.getvalue())
+        self.assertIn('recommended for 10ms: iterations=', out.getvalue())
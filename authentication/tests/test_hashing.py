@@ -0,0 +1,48 @@
+from django.contrib.auth.hashers import make_password
+from django.test import SimpleTestCase, override_settings
+
+from authentication import hashing
+from authentication.hashers import TunablePBKDF2PasswordHasher
+
+
+class TestPasswordHashing(SimpleTestCase):
+    def setUp(self) -> None:
+        hashing._executor = None
+
+    def test_inline_hashing(self):
+        with override_settings(PASSWORD_HASHING_EXECUTOR={'BACKEND': 'inline'}):
+            encoded = hashing.hash_password('secret_password').result()
+            self.assertIsNone(hashing.get_executor())
+            self.assertTrue(hashing.verify_password('secret_password', encoded).result())
+            self.assertFalse(hashing.verify_password('wrong_password', encoded).result())
+
+    def test_thread_pool_hashing(self):
+        encoded = make_password('secret_password')
+        with override_settings(PASSWORD_HASHING_EXECUTOR={'BACKEND': 'thread', 'MAX_WORKERS': 2}):
+            futures = [hashing.verify_password(password, encoded) for password in ('secret_password', 'wrong')]
+            self.assertEqual([future.result() for future in futures], [True, False])
+
+    def test_unknown_backend(self):
+        with override_settings(PASSWORD_HASHING_EXECUTOR={'BACKEND': 'gpu'}), self.assertRaises(ValueError):
+            hashing.get_executor()
+
+    def tearDown(self) -> None:
+        if hashing._executor is not None:
+            hashing._executor.shutdown()
+        hashing._executor = None
+
+
+class TestTunablePBKDF2PasswordHasher(SimpleTestCase):
+    @override_settings(PASSWORD_HASHER_ITERATIONS=1000)
+    def test_iterations_from_settings(self):
+        hasher = TunablePBKDF2PasswordHasher()
+        encoded = hasher.encode('secret_password', hasher.salt())
+        self.assertTrue(encoded.startswith('pbkdf2_sha256$1000$'))
+        self.assertTrue(hasher.verify('secret_password', encoded))
+
+    def test_needs_rehash(self):
+        with override_settings(PASSWORD_HASHER_ITERATIONS=1000):
+            encoded = make_password('secret_password')
+            self.assertFalse(hashing.needs_rehash(encoded))
+        with override_settings(PASSWORD_HASHER_ITERATIONS=2000):
+            self.assertTrue(hashing.needs_rehash(encoded))
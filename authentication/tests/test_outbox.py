@@ -0,0 +1,186 @@
+from io import StringIO
+from smtplib import SMTPException
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from authentication.emails import EmailTemplates
+from authentication.models import OutboxEmail
+
+UserModel = get_user_model()
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise SMTPException('mail server is down')
+
+
+class TestEmailOutbox(TestCase):
+    def setUp(self) -> None:
+        self.user = UserModel.objects.create_user(
+            username='outbox_user',
+            email='outbox@observer.io',
+            first_name='Outbox',
+        )
+
+    def test_activation_email_queued(self):
+        self.assertEqual(len(mail.outbox), 0)
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.recipient, 'outbox@observer.io')
+        self.assertEqual(email.status, OutboxEmail.STATUS.pending)
+        self.assertEqual(email.from_email, 'verification@observer.com')
+        self.assertIn('/activation/', email.html_message)
+
+    def test_send_outbox(self):
+        out = StringIO()
+        call_command('sendoutbox', stdout=out)
+        self.assertIn('Sent 📨: 1 emails, 0 failed', out.getvalue())
+        self.assertIn('Outbox 📬: 0 pending (0 due), 0 failed', out.getvalue())
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['outbox@observer.io'])
+        self.assertEqual(mail.outbox[0].alternatives[0][1], 'text/html')
+
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.status, OutboxEmail.STATUS.sent)
+        self.assertIsNotNone(email.sent_at)
+
+    @override_settings(EMAIL_BACKEND='authentication.tests.test_outbox.FailingEmailBackend')
+    def test_retry_with_backoff(self):
+        call_command('sendoutbox', stdout=StringIO())
+
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.status, OutboxEmail.STATUS.pending)
+        self.assertEqual(email.attempts, 1)
+        self.assertIn('mail server is down', email.last_error)
+        self.assertGreater(email.next_attempt, timezone.now())
+
+        # not due yet, so nothing sent on next run
+        out = StringIO()
+        call_command('sendoutbox', stdout=out)
+        self.assertIn('Sent 📨: 0 emails, 0 failed', out.getvalue())
+
+        OutboxEmail.objects.update(next_attempt=timezone.now(), attempts=4)
+        call_command('sendoutbox', stdout=StringIO())
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboxEmail.STATUS.failed)
+
+    def test_queue_depth(self):
+        OutboxEmail.objects.create(
+            subject='later', recipient='later@observer.io', next_attempt=timezone.now() + timezone.timedelta(hours=1)
+        )
+
+        self.assertEqual(OutboxEmail.objects.queue_depth(), {'pending': 2, 'due': 1, 'failed': 0})
+        out = StringIO()
+        call_command('sendoutbox', stats=True, stdout=out)
+        self.assertEqual(out.getvalue().strip(), 'Outbox 📬: 2 pending (1 due), 0 failed')
+
+    @override_settings(EMAIL_OUTBOX={'ENABLED': False})
+    def test_send_inline_when_outbox_disabled(self):
+        self.user.send_activation_email()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(OutboxEmail.objects.count(), 1)
+
+
+class FlakyEmailBackend(BaseEmailBackend):
+    connections = 0
+
+    def open(self):
+        FlakyEmailBackend.connections += 1
+
+    def send_messages(self, email_messages):
+        for message in email_messages:
+            if message.to == ['broken@observer.io']:
+                raise SMTPException('mailbox unavailable')
+            mail.outbox.append(message)
+        return len(email_messages)
+
+
+@override_settings(
+    EMAIL_OUTBOX={'ENABLED': False},
+    EMAIL_BACKEND='authentication.tests.test_outbox.FlakyEmailBackend'
+)
+class TestBulkEmail(TestCase):
+    def setUp(self) -> None:
+        FlakyEmailBackend.connections = 0
+        self.users = [
+            UserModel(pk=index, username=f'bulk_{index}', email=f'bulk_{index}@observer.io')
+            for index in range(1, 6)
+        ]
+
+    def test_send_bulk_email_in_chunks(self):
+        failures = UserModel.objects.send_bulk_email(
+            self.users,
+            subject='Welcome',
+            template='email/account_activation.html',
+            context_fn=lambda user: {'code': user.username},
+            chunk_size=2,
+        )
+
+        self.assertEqual(failures, {})
+        self.assertEqual(FlakyEmailBackend.connections, 3)
+        self.assertEqual([message.to[0] for message in mail.outbox], [user.email for user in self.users])
+        self.assertIn('/activation/bulk_1', mail.outbox[0].alternatives[0][0])
+
+    def test_failed_recipient_not_abort_batch(self):
+        self.users[1].email = 'broken@observer.io'
+        failures = UserModel.objects.send_activation_emails(self.users)
+
+        self.assertEqual(list(failures), ['broken@observer.io'])
+        self.assertIsInstance(failures['broken@observer.io'], SMTPException)
+        self.assertEqual(len(mail.outbox), 4)
+
+    @override_settings(EMAIL_OUTBOX={'ENABLED': True})
+    def test_bulk_email_queued_with_one_query(self):
+        with self.assertNumQueries(1):
+            UserModel.objects.send_activation_emails(self.users)
+        self.assertEqual(OutboxEmail.objects.count(), 5)
+        self.assertEqual(len(mail.outbox), 0)
+
+    @override_settings(EMAIL_OUTBOX={'ENABLED': True})
+    def test_send_mail_options_forwarded(self):
+        connection = FlakyEmailBackend()
+        self.users[0].send_email(
+            'Welcome', 'email/account_activation.html', {'code': 'code'},
+            message='plain body', from_email='admin@observer.io', connection=connection,
+        )
+        # custom connection never queued on outbox
+        self.assertEqual(OutboxEmail.objects.count(), 0)
+        self.assertEqual(mail.outbox[0].from_email, 'admin@observer.io')
+        self.assertEqual(mail.outbox[0].body, 'plain body')
+        self.assertIs(mail.outbox[0].connection, connection)
+
+        with self.assertRaises(TypeError):
+            self.users[0].send_email('Welcome', 'email/account_activation.html', {}, unknown_option=True)
+
+
+class TestEmailTemplates(TestCase):
+    def setUp(self) -> None:
+        self.templates = EmailTemplates()
+
+    def test_compile_once_per_language(self):
+        compiled = self.templates.get('email/account_activation.html', 'en-us')
+        self.assertIs(self.templates.get('email/account_activation.html', 'en-us'), compiled)
+        self.assertIsNot(self.templates.get('email/account_activation.html', 'ar-eg'), compiled)
+
+    def test_render_plain_text_template(self):
+        plain_message, html_message = self.templates.render('email/account_activation.html', {'code': 'abc'})
+        self.assertIn('https://observer.com/activation/abc', plain_message)
+        self.assertNotIn('<', plain_message)
+        self.assertIn('<a href="https://observer.com/activation/abc">', html_message)
+
+    def test_plain_text_from_html_source(self):
+        compiled = self.templates.compile('404.html', 'en-us')
+        plain_message, html_message = compiled.render({})
+        self.assertEqual(plain_message, strip_tags(html_message))
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmarkemails', messages=5, samples=1, stdout=out)
+        self.assertIn('compiled (en-us)', out.getvalue())
+        self.assertIn('compiled (ar-eg)', out.getvalue())
@@ -0,0 +1,106 @@
+from django.contrib.auth.models import Group, Permission
+from django.test import TestCase
+from model_bakery import baker
+from rest_framework.test import APIRequestFactory
+
+from authentication.permissions import permission_sets
+from utilities.restful.permissions import IsFacilityChief, IsFacilityStaff, ModelPermissions
+
+
+class TestPermissionSet(TestCase):
+    def setUp(self) -> None:
+        self.employee = baker.make('corporations.Employee', user__username='perm_user', is_chief=False)
+        self.user = self.employee.user
+        self.group = baker.make(Group, name='accountants')
+        self.view_facility = Permission.objects.get(codename='view_facility')
+        self.change_facility = Permission.objects.get(codename='change_facility')
+        self.user.groups.add(self.group)
+        permission_sets.cache.local.clear()
+
+    def reload_user(self):
+        return self.user.__class__.objects.get(pk=self.user.pk)
+
+    def test_compiled_permission_set(self):
+        self.group.permissions.add(self.view_facility)
+        self.user.user_permissions.add(self.change_facility)
+
+        permission_set = self.reload_user().permission_set
+        self.assertEqual(permission_set.facility_id, self.employee.facility_id)
+        self.assertFalse(permission_set.is_chief)
+        self.assertEqual(permission_set.permissions, {'corporations.view_facility', 'corporations.change_facility'})
+
+        user = self.reload_user()
+        with self.assertNumQueries(0):
+            self.assertTrue(user.permission_set.has_perm('corporations.view_facility'))
+            self.assertTrue(user.has_perms(['corporations.view_facility', 'corporations.change_facility']))
+            self.assertFalse(user.has_perm('corporations.delete_facility'))
+
+    def test_invalidate_after_group_permissions_change(self):
+        self.assertFalse(self.reload_user().permission_set.has_perm('corporations.view_facility'))
+
+        self.group.permissions.add(self.view_facility)
+        self.assertTrue(self.reload_user().permission_set.has_perm('corporations.view_facility'))
+
+        self.view_facility.group_set.remove(self.group)
+        self.assertFalse(self.reload_user().permission_set.has_perm('corporations.view_facility'))
+
+        self.group.permissions.add(self.view_facility)
+        self.reload_user().permission_set
+        self.group.delete()
+        self.assertFalse(self.reload_user().permission_set.has_perm('corporations.view_facility'))
+
+    def test_invalidate_after_user_groups_change(self):
+        self.group.permissions.add(self.view_facility)
+        self.assertTrue(self.reload_user().permission_set.has_perm('corporations.view_facility'))
+
+        self.group.user_set.clear()
+        self.assertFalse(self.reload_user().permission_set.has_perm('corporations.view_facility'))
+
+        self.user.groups.add(self.group)
+        self.assertTrue(self.reload_user().permission_set.has_perm('corporations.view_facility'))
+
+    def test_invalidate_after_employee_change(self):
+        self.assertFalse(self.reload_user().permission_set.is_chief)
+
+        self.employee.is_chief = True
+        self.employee.save()
+        self.assertTrue(self.reload_user().permission_set.is_chief)
+
+    def test_superuser(self):
+        self.user.is_superuser = True
+        self.user.save()
+        self.assertTrue(self.reload_user().permission_set.has_perm('corporations.delete_facility'))
+
+
+class TestRestfulPermissions(TestCase):
+    def setUp(self) -> None:
+        self.employee = baker.make('corporations.Employee', is_chief=True)
+        self.outsider = baker.make('authentication.User')
+        permission_sets.cache.local.clear()
+
+    def get_request(self, user):
+        request = APIRequestFactory().get('/')
+        request.user = user
+        return request
+
+    def test_facility_staff_permissions(self):
+        request = self.get_request(self.employee.user)
+        self.assertTrue(IsFacilityStaff().has_permission(request, None))
+        self.assertTrue(IsFacilityChief().has_permission(request, None))
+
+        request = self.get_request(self.outsider)
+        self.assertFalse(IsFacilityStaff().has_permission(request, None))
+        self.assertFalse(IsFacilityChief().has_permission(request, None))
+
+    def test_model_permissions(self):
+        class View:
+            queryset = self.employee.__class__.objects.all()
+
+        user = self.employee.user
+        self.assertFalse(ModelPermissions().has_permission(self.get_request(user), View()))
+
+        user.user_permissions.add(Permission.objects.get(codename='view_employee'))
+        user = user.__class__.objects.get(pk=user.pk)
+        user.permission_set
+        with self.assertNumQueries(0):
+            self.assertTrue(ModelPermissions().has_permission(self.get_request(user), View()))
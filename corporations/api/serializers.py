@@ -1,11 +1,48 @@
 from rest_framework import serializers
 
 from corporations.models import Employee
+from corporations.staff import StaffEditor
+from utilities.restful.fieldsets import SparseFieldsetMixin
+from utilities.restful.serializers import CompiledSerializer
 
 
-class ListEmployeeSerializer(serializers.ModelSerializer):
+class ListEmployeeSerializer(SparseFieldsetMixin, CompiledSerializer):
     username = serializers.ReadOnlyField(source='user.username')
 
     class Meta:
         model = Employee
         fields = 'username', 'is_chief',
+
+
+class StaffOperationSerializer(serializers.Serializer):
+    op = serializers.ChoiceField(choices=('create', 'update'))
+    username = serializers.CharField(max_length=50)
+    email = serializers.EmailField(required=False)
+    first_name = serializers.CharField(max_length=30, required=False, allow_blank=True)
+    last_name = serializers.CharField(max_length=90, required=False, allow_blank=True)
+    is_chief = serializers.BooleanField(required=False)
+
+    class Meta:
+        fields = 'op', 'username', 'email', 'first_name', 'last_name', 'is_chief',
+
+    def validate(self, attrs):
+        if attrs['op'] == 'create' and not attrs.get('email'):
+            raise serializers.ValidationError({'email': 'This field is required to create staff member.'})
+        if attrs['op'] == 'update':
+            not_allowed = set(attrs) - {'op', 'username', *StaffEditor.update_fields}
+            if not_allowed:
+                raise serializers.ValidationError({field: 'This field cannot be updated.' for field in not_allowed})
+        return attrs
+
+
+class BulkStaffSerializer(serializers.Serializer):
+    operations = StaffOperationSerializer(many=True, allow_empty=False)
+    max_operations = 1000
+
+    class Meta:
+        fields = 'operations',
+
+    def validate_operations(self, operations: list) -> list:
+        if len(operations) > self.max_operations:
+            raise serializers.ValidationError(f'Ensure there are no more than {self.max_operations} operations.')
+        return operations
@@ -1,11 +1,129 @@
+from django.db.models import F
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 from rest_framework.mixins import ListModelMixin
 
-from corporations.api.serializers import ListEmployeeSerializer
-from corporations.models import Employee
+from corporations.api.serializers import BulkStaffSerializer, ListEmployeeSerializer
+from corporations.models import Employee, Facility
+from corporations.staff import StaffEditor
+from corporations.stamps import facility_stamps
+from utilities.restful.pagination import CursorPagination, VersionedPaginationMixin
+from utilities.exports import csv_lines, jsonl_lines
+from utilities.restful.caching import CachedListMixin
+from utilities.restful.conditional import ConditionalListMixin
+from utilities.restful.negotiation import IgnoreClientContentNegotiation
+from utilities.restful.permissions import IsFacilityChief, IsFacilityStaff
 
 
-class EmployeeViewSet(ListModelMixin, GenericViewSet):
+class EmployeeViewSet(
+    ConditionalListMixin, CachedListMixin, VersionedPaginationMixin, ListModelMixin, GenericViewSet
+):
+    """
+    directory of caller facility staff ordered by username, filtered by query params:
+        is_chief: "true" or "false"
+        username: username prefix
+        fields: comma separated fields to include
+    paginated by cursor since API version 1.2.0.0, unchanged rosters answered by 304 (ETag / Last-Modified)
+    and rendered pages cached until facility stamp changed.
+    facility chief change staff in batches by ``bulk`` action
+    """
     model = Employee
     queryset = Employee.objects.all()
     serializer_class = ListEmployeeSerializer
+    permission_classes = [IsFacilityStaff]
+    versioned_pagination_classes = (('1.2.0.0', CursorPagination),)
+    cursor_ordering = 'username'
+    pagination_count = 'approximate'
+
+    # exported row key and its output name
+    export_fields = {
+        'user__username': 'username',
+        'user__email': 'email',
+        'user__first_name': 'first_name',
+        'user__last_name': 'last_name',
+        'is_chief': 'is_chief',
+        'user__is_verified': 'is_verified',
+        'user__date_joined': 'date_joined',
+    }
+    export_chunk_size = 2000
+
+    def get_facility_stamp(self) -> tuple:
+        if not hasattr(self, '_facility_stamp'):
+            self._facility_stamp = facility_stamps.get(self.request.user.permission_set.facility_id)
+        return self._facility_stamp
+
+    def get_list_stamp(self):
+        version, modified = self.get_facility_stamp()
+        facility_id = self.request.user.permission_set.facility_id
+        return facility_stamps.make_etag(facility_id, version, modified, variant=str(self.request.version))
+
+    def get_cache_scope(self):
+        version, modified = self.get_facility_stamp()
+        return f'{self.request.user.permission_set.facility_id}:{version}:{int(modified * 1000)}'
+
+    def get_queryset(self):
+        queryset = super().get_queryset().filter(
+            facility_id=self.request.user.permission_set.facility_id
+        ).annotate(username=F('user__username')).order_by('username')
+
+        is_chief = self.request.query_params.get('is_chief')
+        if is_chief in ('true', 'false'):
+            queryset = queryset.filter(is_chief=is_chief == 'true')
+
+        username = self.request.query_params.get('username')
+        if username:
+            # served by username "varchar_pattern_ops" index created by django for unique char fields
+            queryset = queryset.filter(user__username__startswith=username)
+
+        # rendered straight from rows of requested fields, username kept for cursor position
+        return self.get_serializer_class().values_queryset(queryset, self.request, 'username')
+
+    @action(
+        methods=['get'],
+        detail=False,
+        url_path=r'export\.(?P<file_format>csv|jsonl)',
+        permission_classes=[IsFacilityChief],
+        content_negotiation_class=IgnoreClientContentNegotiation,
+    )
+    def export(self, request, file_format: str, *args, **kwargs):
+        """
+        stream all facility staff as csv or jsonl file, rows fetched by server side cursor in chunks
+        :param request: request object
+        :param file_format: "csv" or "jsonl"
+        """
+        rows = self.filter_queryset(self.get_queryset()).values(*self.export_fields).iterator(
+            chunk_size=self.export_chunk_size
+        )
+        if file_format == 'csv':
+            lines, content_type = csv_lines(rows, self.export_fields), 'text/csv'
+        else:
+            lines, content_type = jsonl_lines(rows, self.export_fields), 'application/x-ndjson'
+
+        response = StreamingHttpResponse(lines, content_type=f'{content_type}; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="staff.{file_format}"'
+        return response
+
+    @action(methods=['post'], detail=False, url_path='bulk', permission_classes=[IsFacilityChief])
+    def bulk(self, request, *args, **kwargs):
+        """
+        create and update facility staff by list of operations, applied all or nothing in one transaction
+        request body:
+        {
+            'operations': [
+                {'op': 'create', 'username': 'staff', 'email': 'staff@observer.io', 'is_chief': false},
+                {'op': 'update', 'username': 'other_staff', 'is_chief': true},
+            ]
+        }
+        :param request: request object
+        """
+        serializer = BulkStaffSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        facility = Facility.objects.get(pk=request.user.permission_set.facility_id)
+        editor = StaffEditor(facility)
+        if not editor.apply(serializer.validated_data['operations']):
+            raise ValidationError({'operations': {index: [message] for index, message in editor.errors}})
+        return Response({'created': editor.created, 'updated': editor.updated})
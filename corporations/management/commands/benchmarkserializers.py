@@ -0,0 +1,80 @@
+from statistics import median
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import serializers
+
+from authentication.api.serializers import FacilityStaffProfileSerializer
+from authentication.models import User
+from corporations.api.serializers import ListEmployeeSerializer
+from corporations.models import Employee
+
+
+class Command(BaseCommand):
+    help = 'Measure per row cost of employee and profile responses, compiled serializers vs DRF ModelSerializer path'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '-n',
+            '--rows',
+            type=int,
+            dest='rows',
+            default=1000,
+            help='Number of serialized rows per run',
+        )
+        parser.add_argument(
+            '-s',
+            '--samples',
+            type=int,
+            dest='samples',
+            default=5,
+            help='Number of runs, median time used',
+        )
+
+    @staticmethod
+    def make_rows(count: int) -> tuple:
+        """
+        :return: tuple of (employees, employee values rows, users) built in memory, no database needed
+        """
+        users = [
+            User(id=index, username=f'staff_{index}', first_name='first', last_name=f'last {index}', token=f'{index:050x}')
+            for index in range(count)
+        ]
+        employees = [Employee(id=index, user=user, is_chief=index % 10 == 0) for index, user in enumerate(users)]
+        rows = [{'username': employee.user.username, 'is_chief': employee.is_chief} for employee in employees]
+        return employees, rows, users
+
+    @staticmethod
+    def measure(serializer_class, rows: list, samples: int) -> float:
+        """
+        :return: median time of serialize one row in microseconds
+        """
+        timings = []
+        for _ in range(samples):
+            started = perf_counter()
+            serializer_class(rows, many=True).data
+            timings.append((perf_counter() - started) / len(rows) * 1_000_000)
+        return median(timings)
+
+    def handle(self, *args, **options):
+        samples = options['samples']
+        employees, rows, users = self.make_rows(options['rows'])
+
+        # DRF path read rows by fields sources, so rows baseline read username by row key
+        cases = (
+            ('employees', ListEmployeeSerializer, employees, {}),
+            ('employees values() rows', ListEmployeeSerializer, rows, {'username': serializers.ReadOnlyField()}),
+            ('profiles', FacilityStaffProfileSerializer, users, {}),
+        )
+        for name, serializer_class, data, rest_fields in cases:
+            rest_class = type(
+                f'Rest{serializer_class.__name__}', (serializer_class,), {'compiled': False, **rest_fields}
+            )
+            if rest_class(data[:10], many=True).data != serializer_class(data[:10], many=True).data:
+                raise CommandError(f'{name}: compiled and DRF serializers output differ')
+
+            baseline = self.measure(rest_class, data, samples)
+            elapsed = self.measure(serializer_class, data, samples)
+            self.stdout.write(
+                f'{name}: ModelSerializer {baseline:.1f}µs, compiled {elapsed:.1f}µs per row ({baseline / elapsed:.1f}x)'
+            )
@@ -0,0 +1,79 @@
+import sys
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authentication.hashing import create_process_pool
+from corporations.models import Facility
+from corporations.staff import StaffImporter, read_staff_rows
+
+
+class Command(BaseCommand):
+    help = (
+        'Import facility staff from csv or jsonl file, columns: '
+        'username, email, first_name, last_name, password (optional, random if empty), is_chief (optional)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('facility', type=str, help='Facility unique identifier')
+        parser.add_argument('file', type=str, help='Staff file path, use "-" to read from stdin')
+
+        parser.add_argument(
+            '--format',
+            dest='format',
+            choices=['csv', 'jsonl'],
+            help='File format, detected from file extension by default',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            dest='chunk_size',
+            default=1000,
+            help='Number of staff inserted per transaction',
+        )
+        parser.add_argument(
+            '-w',
+            '--workers',
+            type=int,
+            dest='workers',
+            default=None,
+            help='Number of password hashing processes, default is number of CPUs. 0 hash on current process',
+        )
+
+    @staticmethod
+    def get_format(options) -> str:
+        if options['format']:
+            return options['format']
+        if options['file'].endswith('.csv'):
+            return 'csv'
+        if options['file'].endswith(('.jsonl', '.json')):
+            return 'jsonl'
+        raise CommandError('Cannot detect file format, use --format')
+
+    def handle(self, *args, **options):
+        try:
+            facility = Facility.objects.get(uid=options['facility'])
+        except Facility.DoesNotExist:
+            raise CommandError(f'Facility {options["facility"]} does not exist')
+
+        file_format = self.get_format(options)
+        executor = create_process_pool(options['workers']) if options['workers'] != 0 else None
+        stream = sys.stdin if options['file'] == '-' else open(options['file'], newline='', encoding='utf-8')
+
+        started = perf_counter()
+        importer = StaffImporter(facility, executor=executor)
+        try:
+            importer.run(read_staff_rows(stream, file_format), chunk_size=options['chunk_size'])
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+            if executor is not None:
+                executor.shutdown()
+
+        for line_num, message in importer.errors:
+            self.stderr.write(f'Line {line_num}: {message}')
+
+        elapsed = perf_counter() - started
+        self.stdout.write(
+            f'Imported 🥳: {importer.created} staff in {elapsed:.2f}s, {len(importer.errors)} rejected'
+        )
@@ -0,0 +1,17 @@
+# Generated by Django 3.1.5 on 2026-10-18 06:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('corporations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['facility', 'is_chief'], name='employee_facility_chief'),
+        ),
+    ]
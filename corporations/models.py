@@ -84,5 +84,10 @@ class Employee(models.Model):
         help_text='Designates whether the user have permission cross all branches.'
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['facility', 'is_chief'], name='employee_facility_chief'),
+        ]
+
     def __str__(self) -> str:
         return str(self.user)
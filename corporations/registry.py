@@ -0,0 +1,58 @@
+from django.conf import settings
+
+from corporations.models import Facility
+from utilities.caching import MISSING, TieredCache
+
+# cached value of uid that not belong to any facility
+UNKNOWN = False
+
+
+class FacilityRegistry:
+    """
+    Resolve facilities by ``uid`` through local and redis cache, facilities rarely changed
+    so database hit only on first lookup. unknown uids cached too.
+    cache invalidated by ``corporations.signals`` on facility save and delete, and again on commit.
+    """
+
+    def __init__(self):
+        options = getattr(settings, 'FACILITY_CACHE', {})
+        self.cache = TieredCache(
+            prefix='corporations:facility',
+            timeout=options.get('TIMEOUT', 3600),
+            local_size=options.get('LOCAL_SIZE', 1024),
+            local_timeout=options.get('LOCAL_TIMEOUT', 60),
+        )
+        self.field_names = [field.attname for field in Facility._meta.concrete_fields]
+
+    def get(self, uid: str):
+        """
+        :param uid: facility unique identifier
+        :return: Facility instance active or not, or None if uid is unknown
+        """
+        if not uid:
+            return None
+
+        values = self.cache.get(uid, MISSING)
+        if values is MISSING:
+            facility = Facility.objects.filter(uid=uid).first()
+            values = tuple(getattr(facility, name) for name in self.field_names) if facility else UNKNOWN
+            self.cache.set(uid, values)
+
+        if values is UNKNOWN:
+            return None
+        return Facility.from_db(None, self.field_names, values)
+
+    def get_active(self, uid: str):
+        """
+        :return: Facility instance, or None if uid is unknown or facility deactivated
+        """
+        facility = self.get(uid)
+        return facility if facility and facility.is_active else None
+
+    def invalidate(self, *uids: str) -> None:
+        uids = [uid for uid in uids if uid]
+        if uids:
+            self.cache.invalidate(*uids)
+
+
+facilities = FacilityRegistry()
@@ -1,9 +1,75 @@
-from django.db.models.signals import post_delete
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from corporations.models import Employee
+from authentication.permissions import permission_sets
+from corporations.models import Branch, Employee, Facility
+from corporations.registry import facilities
+from corporations.stamps import facility_stamps
+from utilities.caching import model_generations
+
+# cached lists counts of these models invalidated on any change
+model_generations.watch(Employee, Branch, Facility)
+
+# user fields shown on facility roster, change them bump facility stamp
+ROSTER_USER_FIELDS = {'username', 'email', 'first_name', 'last_name', 'is_verified', 'date_joined'}
 
 
 @receiver(post_delete, sender=Employee)
 def delete_auth_account_after_delete_employee(sender, instance, **kwargs):
     instance.user.delete()
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def invalidate_permissions_after_change_employee(sender, instance, **kwargs):
+    # facility and chief flag are part of user permission set
+    permission_sets.invalidate(instance.user_id)
+
+
+@receiver(pre_save, sender=Facility)
+def remember_facility_old_uid(sender, instance, **kwargs):
+    # uid may changed by admin, old uid must be invalidated too
+    if instance.pk:
+        instance._old_uid = Facility.objects.filter(pk=instance.pk).values_list('uid', flat=True).first()
+
+
+@receiver(post_save, sender=Facility)
+def invalidate_facility_after_save(sender, instance, **kwargs):
+    facilities.invalidate(instance.uid, instance.__dict__.pop('_old_uid', None))
+
+
+@receiver(post_delete, sender=Facility)
+def invalidate_facility_after_delete(sender, instance, **kwargs):
+    facilities.invalidate(instance.uid)
+
+
+@receiver(post_save, sender=Facility)
+@receiver(post_delete, sender=Facility)
+def bump_stamp_after_change_facility(sender, instance, **kwargs):
+    facility_stamps.bump(instance.pk)
+
+
+@receiver(pre_save, sender=Branch)
+@receiver(pre_save, sender=Employee)
+def remember_roster_old_facility(sender, instance, **kwargs):
+    # facility may changed by admin, old facility roster changed too
+    if instance.pk:
+        instance._old_facility_id = sender.objects.filter(pk=instance.pk).values_list('facility_id', flat=True).first()
+
+
+@receiver(post_save, sender=Branch)
+@receiver(post_delete, sender=Branch)
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def bump_stamp_after_change_roster(sender, instance, **kwargs):
+    facility_stamps.bump(instance.facility_id, instance.__dict__.pop('_old_facility_id', None))
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def bump_stamp_after_change_staff_account(sender, instance, created, update_fields=None, **kwargs):
+    # only account fields listed on roster matter, ex: password or token changes ignored
+    if created or (update_fields and not set(update_fields) & ROSTER_USER_FIELDS):
+        return
+    facility_id = Employee.objects.filter(user_id=instance.pk).values_list('facility_id', flat=True).first()
+    facility_stamps.bump(facility_id)
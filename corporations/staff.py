@@ -0,0 +1,337 @@
+import csv
+import json
+from functools import partial
+from typing import Iterable, Iterator
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+
+from authentication.availability import remember_users
+from authentication.permissions import permission_sets
+from corporations.models import Employee, Facility
+from corporations.stamps import facility_stamps
+from utilities.caching import model_generations
+from utilities.iterators import chunked
+from utilities.restful.authentication import invalidate_token, invalidate_user
+
+User = get_user_model()
+
+STAFF_FIELDS = 'username', 'email', 'first_name', 'last_name', 'password', 'is_chief',
+
+
+def read_staff_rows(stream, file_format: str) -> Iterator[tuple]:
+    """
+    stream staff rows from csv (with header) or jsonl file
+    :param stream: opened text file
+    :param file_format: "csv" or "jsonl"
+    :return: iterator of (line number, row dict)
+    """
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif file_format == 'jsonl':
+        for line_num, line in enumerate(stream, start=1):
+            if line.strip():
+                try:
+                    yield line_num, json.loads(line)
+                except ValueError:
+                    yield line_num, None
+    else:
+        raise ValueError(f'Unknown staff file format "{file_format}"')
+
+
+class StaffImporter:
+    """
+    create facility staff in chunks, each chunk validated with few queries,
+    its passwords hashed on ``executor`` and saved with bulk insert in one transaction.
+
+    rejected rows collected on ``errors`` as (line number, message) and never abort the import.
+    """
+    duplicate_message = 'Duplicated username or email in file.'
+
+    def __init__(self, facility: Facility, executor=None, queue_emails: bool = True):
+        self.facility = facility
+        self.executor = executor
+        self.queue_emails = queue_emails
+        self.errors = []
+        self.created = 0
+
+    def reject(self, line_num: int, message: str) -> None:
+        self.errors.append((line_num, message))
+
+    def clean_row(self, line_num: int, row) -> dict:
+        """
+        normalize and validate one row fields without database lookup
+        :return: cleaned row, None if row rejected
+        """
+        if not isinstance(row, dict):
+            self.reject(line_num, 'Invalid row format.')
+            return None
+
+        row = {field: str(row.get(field) or '').strip() for field in STAFF_FIELDS}
+        row['username'] = User.normalize_username(row['username'])
+        row['email'] = User.objects.normalize_email(row['email'])
+        row['is_chief'] = row['is_chief'].lower() in ('1', 'true', 'yes')
+
+        try:
+            if not row['username'] or len(row['username']) > 50:
+                raise ValidationError('Username is required, 50 characters or fewer.')
+            User.username_validator(row['username'])
+            validate_email(row['email'])
+        except ValidationError as ex:
+            self.reject(line_num, ' '.join(ex.messages))
+            return None
+
+        if len(row['first_name']) > 30 or len(row['last_name']) > 90:
+            self.reject(line_num, 'First name or last name is too long.')
+            return None
+        return row
+
+    def validate_chunk(self, rows: list) -> list:
+        """
+        reject invalid rows, duplicates inside chunk and already taken usernames and emails
+        :param rows: list of (line number, row dict)
+        :return: list of (line number, cleaned row)
+        """
+        cleaned = []
+        usernames, emails = set(), set()
+        for line_num, row in rows:
+            row = self.clean_row(line_num, row)
+            if row is None:
+                continue
+            if row['username'] in usernames or row['email'].lower() in emails:
+                self.reject(line_num, self.duplicate_message)
+                continue
+            usernames.add(row['username'])
+            emails.add(row['email'].lower())
+            cleaned.append((line_num, row))
+
+        available_usernames = User.objects.check_usernames_availability(usernames)
+        available_emails = User.objects.check_emails_availability([row['email'] for _, row in cleaned])
+
+        valid = []
+        for line_num, row in cleaned:
+            if not available_usernames[row['username']]:
+                self.reject(line_num, 'A user with that username already exists.')
+            elif not available_emails[row['email']]:
+                self.reject(line_num, 'A user with that email address already exists.')
+            else:
+                valid.append((line_num, row))
+        return valid
+
+    def hash_passwords(self, passwords: list) -> list:
+        """
+        hash given passwords on ``executor``, staff without password get unusable one
+        without hashing cost, they set their password on account activation
+        """
+        given = [password for password in passwords if password]
+        if self.executor is None:
+            hashed = iter([make_password(password) for password in given])
+        else:
+            hashed = self.executor.map(make_password, given, chunksize=max(len(given) // 32, 1))
+        return [next(hashed) if password else make_password(None) for password in passwords]
+
+    def import_chunk(self, rows: list, retry: bool = True) -> list:
+        """
+        create users and employees of one chunk in one transaction
+        :param rows: list of (line number, row dict)
+        :param retry: validate chunk again if its usernames or emails taken after validation
+        :return: list of created users
+        """
+        rows = self.validate_chunk(rows)
+        if not rows:
+            return []
+
+        encoded = self.hash_passwords([row['password'] for _, row in rows])
+        users = [
+            User(
+                username=row['username'],
+                email=row['email'],
+                first_name=row['first_name'],
+                last_name=row['last_name'],
+                password=password,
+            )
+            for (_, row), password in zip(rows, encoded)
+        ]
+
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                # bulk create skip model signals, added before commit so users never reported available
+                remember_users(*users)
+                Employee.objects.bulk_create([
+                    Employee(user=user, facility=self.facility, is_chief=row['is_chief'])
+                    for user, (_, row) in zip(users, rows)
+                ])
+                User.objects.send_activation_emails(users, queue=self.queue_emails)
+        except IntegrityError:
+            # created by concurrent writer after validation
+            if retry:
+                return self.import_chunk(rows, retry=False)
+            for line_num, _ in rows:
+                self.reject(line_num, 'A user with that username or email address was created meanwhile.')
+            return []
+
+        model_generations.bump(Employee)
+        facility_stamps.bump(self.facility.pk)
+
+        self.created += len(users)
+        return users
+
+    def run(self, rows: Iterable, chunk_size: int = 1000) -> None:
+        """
+        :param rows: iterable of (line number, row dict), see ``read_staff_rows``
+        :param chunk_size: number of rows inserted per transaction
+        """
+        for chunk in chunked(rows, chunk_size):
+            self.import_chunk(chunk)
+
+
+class StaffEditor(StaffImporter):
+    """
+    apply batch of create/update operations on facility staff all or nothing, operations validated together
+    with set based lookups and saved by bulk queries in one transaction, caches invalidated once per batch.
+
+    operation is dict with "op" ("create" or "update") and staff fields, update change only given
+    ``update_fields`` of staff selected by username. rejected operations collected on ``errors`` as
+    (operation index, message), and nothing saved if any operation rejected.
+    """
+    update_fields = 'is_chief', 'first_name', 'last_name',
+    duplicate_message = 'Duplicated username or email in operations.'
+
+    def __init__(self, facility: Facility, executor=None, queue_emails: bool = True):
+        super().__init__(facility, executor, queue_emails)
+        self.updated = 0
+
+    def validate_updates(self, rows: list) -> list:
+        """
+        reject duplicated and unknown staff, staff fetched by one query
+        :param rows: list of (operation index, operation dict)
+        :return: list of (operation index, employee, operation dict)
+        """
+        selected = {}
+        for index, row in rows:
+            username = User.normalize_username(str(row.get('username') or '').strip())
+            if username in selected:
+                self.reject(index, 'Duplicated username in operations.')
+            else:
+                selected[username] = index, row
+
+        employees = Employee.objects.filter(facility=self.facility, user__username__in=selected).select_related(
+            'user'
+        ).only('id', 'is_chief', 'facility_id', 'user__id', 'user__username', 'user__first_name', 'user__last_name',
+               'user__token')
+        employees = {employee.user.username: employee for employee in employees}
+
+        valid = []
+        for username, (index, row) in selected.items():
+            if username not in employees:
+                self.reject(index, 'Staff member does not exist.')
+            else:
+                valid.append((index, employees[username], row))
+        return valid
+
+    def update_staff(self, rows: list) -> list:
+        """
+        change employees and their users in memory and save them with bulk updates
+        :param rows: list of (operation index, employee, operation dict)
+        :return: list of changed employees
+        """
+        changed, changed_employees, changed_users = [], [], []
+        for _, employee, row in rows:
+            chief_changed = 'is_chief' in row and employee.is_chief != row['is_chief']
+            if chief_changed:
+                employee.is_chief = row['is_chief']
+                changed_employees.append(employee)
+
+            user_changes = {
+                field: row[field] for field in self.update_fields
+                if field != 'is_chief' and field in row and getattr(employee.user, field) != row[field]
+            }
+            for field, value in user_changes.items():
+                setattr(employee.user, field, value)
+            if user_changes:
+                changed_users.append(employee.user)
+
+            if chief_changed or user_changes:
+                changed.append(employee)
+
+        if changed_employees:
+            Employee.objects.bulk_update(changed_employees, ['is_chief'])
+        if changed_users:
+            User.objects.bulk_update(changed_users, [field for field in self.update_fields if field != 'is_chief'])
+        return changed
+
+    def invalidate(self, changed: list) -> None:
+        """
+        bulk queries skip model signals, so caches of whole batch invalidated once after commit
+        :param changed: updated employees
+        """
+        user_ids = [employee.user_id for employee in changed]
+        invalidate_user(*user_ids)
+        invalidate_token(*[employee.user.token for employee in changed])
+        permission_sets.invalidate(*user_ids)
+        model_generations.bump(Employee)
+        facility_stamps.bump(self.facility.pk)
+
+    def apply(self, operations: list) -> bool:
+        """
+        :param operations: list of operation dicts
+        :return: False if some operation rejected, nothing saved then
+        """
+        creates, updates = [], []
+        for index, row in enumerate(operations):
+            op = row.get('op') if isinstance(row, dict) else None
+            if op == 'create':
+                creates.append((index, row))
+            elif op == 'update':
+                updates.append((index, row))
+            else:
+                self.reject(index, 'Unknown operation.')
+
+        creates = self.validate_chunk(creates)
+        updates = self.validate_updates(updates)
+        if self.errors:
+            self.errors.sort()
+            return False
+
+        encoded = self.hash_passwords([row['password'] for _, row in creates])
+        users = [
+            User(
+                username=row['username'],
+                email=row['email'],
+                first_name=row['first_name'],
+                last_name=row['last_name'],
+                password=password,
+            )
+            for (_, row), password in zip(creates, encoded)
+        ]
+
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                # bulk queries skip model signals, added before commit so users never reported available
+                remember_users(*users)
+                Employee.objects.bulk_create([
+                    Employee(user=user, facility=self.facility, is_chief=row['is_chief'])
+                    for user, (_, row) in zip(users, creates)
+                ])
+                changed = self.update_staff(updates)
+                User.objects.send_activation_emails(users, queue=self.queue_emails)
+                transaction.on_commit(partial(self.invalidate, changed))
+        except IntegrityError:
+            # usernames or emails taken by concurrent writer after validation
+            self.validate_chunk(creates)
+            if not self.errors:
+                for index, _ in creates:
+                    self.reject(index, 'A user with that username or email address was created meanwhile.')
+            self.errors.sort()
+            return False
+
+        self.created += len(users)
+        self.updated += len(changed)
+        return True
@@ -0,0 +1,67 @@
+from time import time
+
+from django.db import transaction
+from django_redis import get_redis_connection
+
+
+class FacilityStamps:
+    """
+    Per facility roster change stamp saved on redis hash of version counter and modified time,
+    bumped by ``corporations.signals`` on any change of facility, its branches, staff or staff accounts.
+    used to answer conditional requests (ETag / Last-Modified) without touching database.
+    """
+    prefix = 'corporations:stamp'
+
+    @property
+    def connection(self):
+        return get_redis_connection('default')
+
+    def make_key(self, facility_id: int) -> str:
+        return f'{self.prefix}:{facility_id}'
+
+    def bump(self, *facility_ids: int) -> None:
+        """
+        change stamps now, and again when current transaction commit, so requests served
+        before commit with old data never keep the new stamp
+        """
+        self._bump(facility_ids)
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(lambda: self._bump(facility_ids))
+
+    def _bump(self, facility_ids) -> None:
+        now = time()
+        with self.connection.pipeline(transaction=False) as pipeline:
+            for facility_id in set(facility_ids):
+                if facility_id:
+                    key = self.make_key(facility_id)
+                    pipeline.hincrby(key, 'version', 1)
+                    pipeline.hset(key, 'modified', now)
+            pipeline.execute()
+
+    def get(self, facility_id: int) -> tuple:
+        """
+        :return: tuple of (version, modified timestamp), stamp started now if facility has no stamp
+        """
+        key = self.make_key(facility_id)
+        version, modified = self.connection.hmget(key, 'version', 'modified')
+        if modified is None:
+            # never changed since stamps started (or stamp evicted), start it with current time
+            modified = time()
+            self.connection.hsetnx(key, 'modified', modified)
+            version, modified = self.connection.hmget(key, 'version', 'modified')
+        return int(version or 0), float(modified)
+
+    @staticmethod
+    def make_etag(facility_id: int, version: int, modified: float, variant: str = '') -> tuple:
+        """
+        :param variant: extra value of response representation, ex: API version
+        :return: tuple of (etag, last modified timestamp)
+        """
+        etag = f'{facility_id}-{version}-{int(modified * 1000)}'
+        return f'"{etag}-{variant}"' if variant else f'"{etag}"', int(modified)
+
+    def etag(self, facility_id: int, variant: str = '') -> tuple:
+        return self.make_etag(facility_id, *self.get(facility_id), variant=variant)
+
+
+facility_stamps = FacilityStamps()
@@ -0,0 +1,325 @@
+import csv
+import json
+from unittest import mock
+
+from django.shortcuts import reverse
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from authentication.models import OutboxEmail, User
+from authentication.permissions import permission_sets
+from corporations.models import Employee
+from corporations.staff import StaffEditor
+from corporations.stamps import facility_stamps
+from utilities.restful.throttling import SlidingWindowThrottle
+
+
+class TestEmployeeViewSet(APITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        SlidingWindowThrottle.reset_history()
+        permission_sets.cache.local.clear()
+        self.facility = baker.make('corporations.Facility', uid='directory-test')
+        self.chief = baker.make(
+            'corporations.Employee', user__username='chief_user', facility=self.facility, is_chief=True
+        )
+        for index in range(30):
+            baker.make(
+                'corporations.Employee',
+                user__username=f'staff_{chr(97 + index // 26)}{chr(97 + index % 26)}',
+                user__email=f'staff{index}@observer.io',
+                facility=self.facility,
+            )
+        # another facility staff never listed
+        baker.make('corporations.Employee', user__username='stranger')
+
+        self.chief.user.generate_token()
+        self.client.credentials(HTTP_API_VERSION='1.1.0.0', HTTP_AUTHORIZATION=f'Token {self.chief.user.token}')
+        self.api_url = reverse('corporations:employee-list')
+
+    def test_list_facility_staff(self):
+        response = self.client.get(self.api_url, {'page_size': 100})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 31)
+        usernames = [row['username'] for row in response.data['result']]
+        self.assertNotIn('stranger', usernames)
+        self.assertEqual(usernames, sorted(usernames))
+
+    def test_filter_staff(self):
+        response = self.client.get(self.api_url, {'is_chief': 'true'})
+        self.assertEqual([row['username'] for row in response.data['result']], ['chief_user'])
+
+        response = self.client.get(self.api_url, {'username': 'staff_b', 'is_chief': 'false'})
+        self.assertEqual(response.data['count'], 4)
+
+    def test_constant_queries_per_page(self):
+        self.client.get(self.api_url)
+
+        for page_size in (1, 10, 30):
+            # page query only, user, its permissions and list count served from cache
+            with self.assertNumQueries(1):
+                response = self.client.get(self.api_url, {'page_size': page_size})
+            self.assertEqual(len(response.data['result']), page_size)
+
+    def test_sparse_fieldset(self):
+        response = self.client.get(self.api_url, {'fields': 'username,unknown', 'is_chief': 'true'})
+        self.assertEqual(response.data['result'], [{'username': 'chief_user'}])
+
+        response = self.client.get(self.api_url, {'fields': 'is_chief', 'page_size': 1})
+        self.assertEqual(response.data['result'], [{'is_chief': True}])
+
+    def test_user_without_facility(self):
+        user = baker.make('authentication.User')
+        user.generate_token()
+        self.client.credentials(HTTP_API_VERSION='1.1.0.0', HTTP_AUTHORIZATION=f'Token {user.token}')
+        response = self.client.get(self.api_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_cursor_pagination(self):
+        self.client.credentials(HTTP_API_VERSION='1.2.0.0', HTTP_AUTHORIZATION=f'Token {self.chief.user.token}')
+        self.client.get(self.api_url)
+
+        usernames = []
+        url = f'{self.api_url}?page_size=8'
+        while url:
+            # planner estimate and page queries
+            with self.assertNumQueries(2):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(list(response.data), ['next', 'previous', 'count', 'result', 'status'])
+            self.assertIsInstance(response.data['count'], int)
+            usernames += [row['username'] for row in response.data['result']]
+            url = response.data['next']
+
+        self.assertEqual(len(usernames), 31)
+        self.assertEqual(usernames, sorted(usernames))
+
+    def test_export_csv(self):
+        response = self.client.get(reverse('corporations:employee-export', args=['csv']))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'username,email,first_name,last_name,is_chief,is_verified,date_joined')
+        self.assertEqual(len(lines), 32)
+        self.assertTrue(lines[1].startswith('chief_user,'))
+        self.assertNotIn('stranger', ''.join(lines))
+
+    def test_export_with_file_accept_header(self):
+        response = self.client.get(reverse('corporations:employee-export', args=['csv']), HTTP_ACCEPT='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+
+        response = self.client.get(
+            reverse('corporations:employee-export', args=['jsonl']), HTTP_ACCEPT='application/x-ndjson'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_export_csv_escape_formulas(self):
+        User.objects.filter(username='staff_aa').update(first_name='=HYPERLINK("http://evil")', last_name='-1+2')
+        response = self.client.get(reverse('corporations:employee-export', args=['csv']), {'username': 'staff_aa'})
+        row = next(csv.reader(b''.join(response.streaming_content).decode().splitlines()[1:]))
+        self.assertEqual(row[2:4], ['\'=HYPERLINK("http://evil")', "'-1+2"])
+
+    def test_export_jsonl(self):
+        response = self.client.get(reverse('corporations:employee-export', args=['jsonl']), {'is_chief': 'false'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), 30)
+        self.assertEqual(rows[0]['username'], 'staff_aa')
+        self.assertFalse(rows[0]['is_chief'])
+
+    def test_export_only_for_chief(self):
+        staff = self.chief.facility.staff.get(user__username='staff_aa').user
+        staff.generate_token()
+        self.client.credentials(HTTP_API_VERSION='1.1.0.0', HTTP_AUTHORIZATION=f'Token {staff.token}')
+        response = self.client.get(reverse('corporations:employee-export', args=['csv']))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_conditional_list(self):
+        response = self.client.get(self.api_url)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.api_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+        response = self.client.get(self.api_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # other API version has another representation
+        self.client.credentials(HTTP_API_VERSION='1.2.0.0', HTTP_AUTHORIZATION=f'Token {self.chief.user.token}')
+        response = self.client.get(self.api_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_roster_change_bump_stamp(self):
+        etag = self.client.get(self.api_url)['ETag']
+        baker.make('corporations.Employee', user__username='new_staff', facility=self.facility)
+        response = self.client.get(self.api_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        etag = response['ETag']
+        user = self.facility.staff.get(user__username='staff_aa').user
+        user.set_password('new-password')
+        user.save(update_fields=['password'])
+        response = self.client.get(self.api_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        user.username = 'staff_renamed'
+        user.save()
+        response = self.client.get(self.api_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_moved_staff_bump_old_facility_stamp(self):
+        response = self.client.get(self.api_url, {'username': 'staff_aa'})
+        etag = response['ETag']
+        self.assertEqual(len(response.data['result']), 1)
+
+        employee = self.facility.staff.get(user__username='staff_aa')
+        employee.facility = baker.make('corporations.Facility')
+        employee.save()
+
+        response = self.client.get(self.api_url, {'username': 'staff_aa'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content)['result'], [])
+
+    def test_token_changes_keep_stamp(self):
+        version = facility_stamps.get(self.facility.pk)[0]
+        user = self.facility.staff.get(user__username='staff_aa').user
+        # only the user update in savepoint, no facility lookup
+        with self.assertNumQueries(3):
+            user.generate_token()
+        user.revoke_token()
+        user.revoke_signed_tokens()
+        user.update_last_login()
+        self.assertEqual(facility_stamps.get(self.facility.pk)[0], version)
+
+    def test_cached_response(self):
+        response = self.client.get(self.api_url, {'page_size': 5})
+        content = response.content
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.api_url, {'page_size': 5})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, content)
+        self.assertIn('ETag', response)
+
+        # query params and API version are part of the key
+        response = self.client.get(self.api_url, {'page_size': 5, 'is_chief': 'true'})
+        self.assertEqual(json.loads(response.content)['count'], 1)
+        self.client.credentials(HTTP_API_VERSION='1.2.0.0', HTTP_AUTHORIZATION=f'Token {self.chief.user.token}')
+        response = self.client.get(self.api_url, {'page_size': 5})
+        self.assertNotIn('pages', json.loads(response.content))
+
+    def test_cached_response_retired_by_roster_change(self):
+        self.client.get(self.api_url, {'username': 'new'})
+        baker.make('corporations.Employee', user__username='new_staff', facility=self.facility)
+
+        response = self.client.get(self.api_url, {'username': 'new'})
+        self.assertEqual([row['username'] for row in json.loads(response.content)['result']], ['new_staff'])
+
+    def test_bulk_staff_operations_only_for_chief(self):
+        staff = self.facility.staff.get(user__username='staff_aa').user
+        staff.generate_token()
+        self.client.credentials(HTTP_API_VERSION='1.1.0.0', HTTP_AUTHORIZATION=f'Token {staff.token}')
+        response = self.client.post(reverse('corporations:employee-bulk'), {'operations': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class TestBulkStaff(APITransactionTestCase):
+    # caches of bulk operations invalidated on commit, so run tests outside test case transaction
+    def setUp(self) -> None:
+        super().setUp()
+        SlidingWindowThrottle.reset_history()
+        permission_sets.cache.local.clear()
+        self.facility = baker.make('corporations.Facility', uid='bulk-test')
+        self.chief = baker.make(
+            'corporations.Employee', user__username='chief_user', facility=self.facility, is_chief=True
+        )
+        for username in ('staff_aa', 'staff_ab', 'staff_ac'):
+            baker.make('corporations.Employee', user__username=username, facility=self.facility)
+        baker.make('corporations.Employee', user__username='stranger')
+
+        self.chief.user.generate_token()
+        self.client.credentials(HTTP_API_VERSION='1.1.0.0', HTTP_AUTHORIZATION=f'Token {self.chief.user.token}')
+        self.api_url = reverse('corporations:employee-bulk')
+
+    def test_bulk_staff_operations(self):
+        staff = self.facility.staff.select_related('user').get(user__username='staff_aa')
+        permission_sets.get(staff.user)
+        version = facility_stamps.get(self.facility.pk)[0]
+
+        data = {'operations': [
+            {'op': 'create', 'username': 'bulk_staff', 'email': 'bulk@observer.io', 'is_chief': True},
+            {'op': 'create', 'username': 'bulk_other', 'email': 'bulk_other@observer.io', 'first_name': 'Bulk'},
+            {'op': 'update', 'username': 'staff_aa', 'is_chief': True, 'last_name': 'Changed'},
+            {'op': 'update', 'username': 'staff_ab', 'is_chief': False},
+        ]}
+        response = self.client.post(self.api_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'created': 2, 'updated': 1})
+
+        self.assertTrue(Employee.objects.get(user__username='bulk_staff', facility=self.facility).is_chief)
+        self.assertEqual(Employee.objects.get(user__username='bulk_other').user.first_name, 'Bulk')
+        staff.refresh_from_db()
+        staff.user.refresh_from_db()
+        self.assertTrue(staff.is_chief)
+        self.assertEqual(staff.user.last_name, 'Changed')
+        self.assertTrue(permission_sets.get(staff.user).is_chief)
+        self.assertEqual(OutboxEmail.objects.filter(recipient__in=['bulk@observer.io', 'bulk_other@observer.io']).count(), 2)
+        # whole batch bump facility stamp once
+        self.assertEqual(facility_stamps.get(self.facility.pk)[0], version + 1)
+
+    def test_bulk_staff_operations_all_or_nothing(self):
+        data = {'operations': [
+            {'op': 'create', 'username': 'bulk_staff', 'email': 'bulk@observer.io'},
+            {'op': 'create', 'username': 'staff_ac', 'email': 'new@observer.io'},
+            {'op': 'update', 'username': 'stranger', 'is_chief': True},
+            {'op': 'update', 'username': 'staff_aa', 'is_chief': True},
+        ]}
+        response = self.client.post(self.api_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data['operations']), {1, 2})
+        self.assertFalse(Employee.objects.filter(user__username='bulk_staff').exists())
+        self.assertFalse(Employee.objects.get(user__username='staff_aa').is_chief)
+
+        response = self.client.post(self.api_url, {'operations': [
+            {'op': 'create', 'username': 'bulk_staff'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_staff_created_meanwhile(self):
+        validate_chunk = StaffEditor.validate_chunk
+
+        def validate_before_concurrent_insert(editor, rows):
+            valid = validate_chunk(editor, rows)
+            if not User.objects.filter(username='racing_staff').exists():
+                baker.make('authentication.User', username='racing_staff', email='racing_other@observer.io')
+            return valid
+
+        data = {'operations': [
+            {'op': 'create', 'username': 'racing_staff', 'email': 'racing@observer.io'},
+            {'op': 'update', 'username': 'staff_aa', 'is_chief': True},
+        ]}
+        with mock.patch.object(StaffEditor, 'validate_chunk', validate_before_concurrent_insert):
+            response = self.client.post(self.api_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['operations'], {0: ['A user with that username already exists.']})
+        self.assertFalse(Employee.objects.get(user__username='staff_aa').is_chief)
+
+    def test_bulk_staff_operations_reject_not_updatable_fields(self):
+        data = {'operations': [{'op': 'update', 'username': 'staff_aa', 'email': 'changed@observer.io'}]}
+        response = self.client.post(self.api_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotEqual(User.objects.get(username='staff_aa').email, 'changed@observer.io')
+
+        data = {'operations': [
+            {'op': 'create', 'username': 'bulk_staff', 'email': 'bulk@observer.io'},
+            {'op': 'create', 'username': 'bulk_staff', 'email': 'other@observer.io'},
+        ]}
+        response = self.client.post(self.api_url, data, format='json')
+        self.assertEqual(response.data['operations'], {1: ['Duplicated username or email in operations.']})
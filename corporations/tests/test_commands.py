@@ -0,0 +1,128 @@
+import json
+import os
+from io import StringIO
+from tempfile import NamedTemporaryFile
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from model_bakery import baker
+
+from authentication.activation import activation_codes
+from authentication.models import OutboxEmail
+from corporations.models import Employee
+from corporations.staff import StaffImporter
+
+UserModel = get_user_model()
+
+
+class TestImportStaffCommand(TestCase):
+    def setUp(self) -> None:
+        self.facility = baker.make('corporations.Facility', uid='import-test')
+        baker.make('authentication.User', username='taken_user', email='taken@observer.io')
+
+    def write_file(self, content: str, suffix: str) -> str:
+        file = NamedTemporaryFile('w', suffix=suffix, delete=False)
+        with file:
+            file.write(content)
+        self.addCleanup(os.remove, file.name)
+        return file.name
+
+    def call(self, path: str, **options) -> tuple:
+        out, err = StringIO(), StringIO()
+        call_command('importstaff', 'import-test', path, workers=0, stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def test_import_csv(self):
+        path = self.write_file(
+            'username,email,first_name,last_name,password,is_chief\n'
+            'first_staff,first@observer.io,First,Staff,secret123,true\n'
+            'second_staff,second@observer.io,Second,Staff,,\n'
+            'Bad Name,bad@observer.io,,,,\n'
+            'third_staff,not-email,,,,\n'
+            'taken_user,new@observer.io,,,,\n'
+            'fourth_staff,taken@observer.io,,,,\n'
+            'first_staff,other@observer.io,,,,\n',
+            '.csv'
+        )
+        out, err = self.call(path, chunk_size=10)
+
+        self.assertIn('Imported 🥳: 2 staff', out)
+        self.assertIn('5 rejected', out)
+        for line_num in range(4, 9):
+            self.assertIn(f'Line {line_num}:', err)
+
+        first = UserModel.objects.get(username='first_staff')
+        self.assertTrue(first.check_password('secret123'))
+        self.assertTrue(first.facility_staff.is_chief)
+        self.assertEqual(first.facility_staff.facility, self.facility)
+        second = UserModel.objects.get(username='second_staff')
+        # password set on account activation
+        self.assertFalse(second.has_usable_password())
+        self.assertFalse(second.facility_staff.is_chief)
+
+        # activation emails queued, not sent inline
+        self.assertEqual(OutboxEmail.objects.filter(recipient__in=[first.email, second.email]).count(), 2)
+        self.assertIsNotNone(activation_codes.get_user_code(first.pk))
+        activation_codes.revoke_user(first.pk)
+        activation_codes.revoke_user(second.pk)
+
+    def test_import_jsonl_in_chunks(self):
+        rows = [
+            json.dumps({'username': f'staff_{chr(97 + index)}', 'email': f'staff{index}@observer.io'})
+            for index in range(5)
+        ]
+        path = self.write_file('\n'.join(rows + ['not json']), '.jsonl')
+        # facility lookup, then per chunk: validate usernames and emails,
+        # then savepoint with bulk insert of users, employees and emails
+        with self.assertNumQueries(1 + 3 * 7):
+            out, err = self.call(path, chunk_size=2)
+
+        self.assertIn('Imported 🥳: 5 staff', out)
+        self.assertIn('Line 6: Invalid row format.', err)
+        self.assertEqual(Employee.objects.filter(facility=self.facility).count(), 5)
+        for user in UserModel.objects.filter(username__startswith='staff_'):
+            activation_codes.revoke_user(user.pk)
+
+    def test_import_with_process_pool(self):
+        path = self.write_file(
+            'username,email,password\n'
+            'pool_staff,pool@observer.io,secret123\n'
+            'other_pool_staff,other_pool@observer.io,secret456\n',
+            '.csv'
+        )
+        out = StringIO()
+        call_command('importstaff', 'import-test', path, workers=1, stdout=out)
+
+        self.assertIn('Imported 🥳: 2 staff', out.getvalue())
+        for username, password in (('pool_staff', 'secret123'), ('other_pool_staff', 'secret456')):
+            user = UserModel.objects.get(username=username)
+            self.assertTrue(user.password.startswith('pbkdf2_sha256$'))
+            self.assertTrue(user.check_password(password))
+            activation_codes.revoke_user(user.pk)
+
+    def test_concurrent_created_user_not_abort_import(self):
+        importer = StaffImporter(self.facility, queue_emails=True)
+        validate_chunk = importer.validate_chunk
+
+        def validate_before_concurrent_insert(rows):
+            valid = validate_chunk(rows)
+            if not UserModel.objects.filter(username='racing_staff').exists():
+                baker.make('authentication.User', username='racing_staff', email='racing_other@observer.io')
+            return valid
+
+        importer.validate_chunk = validate_before_concurrent_insert
+        importer.run([
+            (2, {'username': 'racing_staff', 'email': 'racing@observer.io'}),
+            (3, {'username': 'calm_staff', 'email': 'calm@observer.io'}),
+        ])
+
+        self.assertEqual(importer.created, 1)
+        self.assertEqual(importer.errors, [(2, 'A user with that username already exists.')])
+        user = UserModel.objects.get(username='calm_staff')
+        self.assertEqual(user.facility_staff.facility, self.facility)
+        activation_codes.revoke_user(user.pk)
+
+    def test_unknown_facility(self):
+        with self.assertRaises(CommandError):
+            call_command('importstaff', 'unknown', 'staff.csv')
@@ -0,0 +1,50 @@
+from django.test import TestCase
+from model_bakery import baker
+
+from corporations.models import Facility
+from corporations.registry import facilities
+
+
+class TestFacilityRegistry(TestCase):
+    def setUp(self) -> None:
+        self.facility = baker.make('corporations.Facility', uid='registry-test', is_active=True)
+        facilities.cache.local.clear()
+
+    def test_get_cached_facility(self):
+        facility = facilities.get('registry-test')
+        self.assertEqual(facility.id, self.facility.id)
+        self.assertEqual(facility.name, self.facility.name)
+
+        with self.assertNumQueries(0):
+            facility = facilities.get_active('registry-test')
+        self.assertEqual(facility.id, self.facility.id)
+
+    def test_unknown_uid_cached(self):
+        self.assertIsNone(facilities.get('unknown-test'))
+        with self.assertNumQueries(0):
+            self.assertIsNone(facilities.get('unknown-test'))
+
+        facility = baker.make('corporations.Facility', uid='unknown-test')
+        self.assertEqual(facilities.get('unknown-test').id, facility.id)
+        facility.delete()
+
+    def test_invalidate_after_save(self):
+        facilities.get('registry-test')
+
+        self.facility.is_active = False
+        self.facility.save()
+        self.assertIsNone(facilities.get_active('registry-test'))
+        self.assertIsNotNone(facilities.get('registry-test'))
+
+        self.facility.uid = 'renamed-test'
+        self.facility.save()
+        self.assertIsNone(facilities.get('registry-test'))
+        self.assertEqual(facilities.get('renamed-test').id, self.facility.id)
+
+    def test_invalidate_after_delete(self):
+        facilities.get('registry-test')
+        Facility.objects.get(pk=self.facility.pk).delete()
+        self.assertIsNone(facilities.get('registry-test'))
+
+    def tearDown(self) -> None:
+        Facility.objects.all().delete()
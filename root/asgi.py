@@ -3,6 +3,9 @@ ASGI config for Observer project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Async views (like ``auth/facility-staff/async-login/``) run on the event loop when served by ASGI,
+and await CPU heavy work (password hashing) on executors, see ``authentication.hashing``.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/3.1/howto/deployment/asgi/
 """
@@ -107,6 +107,62 @@ CACHES = {
     }
 }
 
+# Authenticated users cache, timeouts in seconds
+# local cache is per process and not invalidated cross processes, so keep it short
+AUTH_TOKEN_CACHE = {
+    'TIMEOUT': config('AUTH_TOKEN_CACHE_TIMEOUT', default=300, cast=int),
+    'LOCAL_SIZE': config('AUTH_TOKEN_LOCAL_CACHE_SIZE', default=1024, cast=int),
+    'LOCAL_TIMEOUT': config('AUTH_TOKEN_LOCAL_CACHE_TIMEOUT', default=30, cast=int),
+    # revoked tokens kept on denylist for token lifetime, or this many seconds if tokens never expire
+    'REVOKED_TIMEOUT': config('AUTH_TOKEN_REVOKED_TIMEOUT', default=90 * 86400, cast=int),
+}
+
+# API tokens lifetime in seconds, 0 mean tokens never expire
+AUTH_TOKEN_LIFETIME = config('AUTH_TOKEN_LIFETIME', default=30 * 86400, cast=int)
+
+# Issue stateless signed API tokens on login instead of database stored tokens
+# both token types still accepted by authentication
+AUTH_SIGNED_TOKENS = config('AUTH_SIGNED_TOKENS', default=False, cast=bool)
+
+# Bloom filters let usernames, emails and tokens availability checks skip database for new values,
+# filters must be built by "rebuildavailability" command before use
+AVAILABILITY_BLOOM_FILTER = {
+    'ENABLED': config('AVAILABILITY_BLOOM_FILTER_ENABLED', default=False, cast=bool),
+    'CAPACITY': config('AVAILABILITY_BLOOM_FILTER_CAPACITY', default=1000000, cast=int),
+    'ERROR_RATE': config('AVAILABILITY_BLOOM_FILTER_ERROR_RATE', default=0.001, cast=float),
+}
+
+# Account activation codes lifetime in seconds, a new code invalidate the outstanding one
+ACTIVATION_CODE_TIMEOUT = config('ACTIVATION_CODE_TIMEOUT', default=86400, cast=int)
+
+# Facilities registry cache (lookup by uid), timeouts in seconds
+FACILITY_CACHE = {
+    'TIMEOUT': config('FACILITY_CACHE_TIMEOUT', default=3600, cast=int),
+    'LOCAL_SIZE': config('FACILITY_LOCAL_CACHE_SIZE', default=1024, cast=int),
+    'LOCAL_TIMEOUT': config('FACILITY_LOCAL_CACHE_TIMEOUT', default=60, cast=int),
+}
+
+# Users compiled permissions (django permissions and facility role) cache, timeouts in seconds
+PERMISSION_CACHE = {
+    'TIMEOUT': config('PERMISSION_CACHE_TIMEOUT', default=3600, cast=int),
+    'LOCAL_SIZE': config('PERMISSION_LOCAL_CACHE_SIZE', default=1024, cast=int),
+    'LOCAL_TIMEOUT': config('PERMISSION_LOCAL_CACHE_TIMEOUT', default=30, cast=int),
+}
+
+# Paginated lists exact counts cache, invalidated when list models changed, timeouts in seconds
+PAGINATION_COUNT_CACHE = {
+    'TIMEOUT': config('PAGINATION_COUNT_CACHE_TIMEOUT', default=60, cast=int),
+    'LOCAL_SIZE': config('PAGINATION_COUNT_LOCAL_CACHE_SIZE', default=1024, cast=int),
+    'LOCAL_TIMEOUT': config('PAGINATION_COUNT_LOCAL_CACHE_TIMEOUT', default=30, cast=int),
+}
+
+# Rendered list responses cache, entries retired by scope generation (ex: facility stamp), timeouts in seconds
+RESPONSE_CACHE = {
+    'TIMEOUT': config('RESPONSE_CACHE_TIMEOUT', default=300, cast=int),
+    'LOCAL_SIZE': config('RESPONSE_LOCAL_CACHE_SIZE', default=256, cast=int),
+    'LOCAL_TIMEOUT': config('RESPONSE_LOCAL_CACHE_TIMEOUT', default=30, cast=int),
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
@@ -126,6 +182,24 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# first hasher used to hash new passwords, others only verify (and upgrade) old hashes
+PASSWORD_HASHERS = [
+    'authentication.hashers.TunablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
+# PBKDF2 work factor, use "calibratehashers" command to tune it for this machine
+PASSWORD_HASHER_ITERATIONS = config('PASSWORD_HASHER_ITERATIONS', default=216000, cast=int)
+
+# Executor used to verify and hash passwords off the request thread
+# BACKEND is one of: thread, process or inline (run on request thread)
+PASSWORD_HASHING_EXECUTOR = {
+    'BACKEND': config('PASSWORD_HASHING_BACKEND', default='thread'),
+    'MAX_WORKERS': config('PASSWORD_HASHING_WORKERS', default=4, cast=int),
+}
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/3.1/topics/i18n/
@@ -171,6 +245,19 @@ else:
     EMAIL_USE_TLS = config('EMAIL_TLS', cast=bool)
     EMAIL_USE_SSL = config('EMAIL_SSL', cast=bool)
 
+# number of emails sent over one mail server connection by bulk email API
+EMAIL_BULK_CHUNK_SIZE = config('EMAIL_BULK_CHUNK_SIZE', default=100, cast=int)
+
+# user emails queued on outbox table and delivered by "sendoutbox" command
+EMAIL_OUTBOX = {
+    'ENABLED': config('EMAIL_OUTBOX_ENABLED', default=True, cast=bool),
+    'BATCH_SIZE': config('EMAIL_OUTBOX_BATCH_SIZE', default=100, cast=int),
+    'MAX_ATTEMPTS': config('EMAIL_OUTBOX_MAX_ATTEMPTS', default=5, cast=int),
+    # seconds to wait after first failure, doubled on every next failure
+    'RETRY_DELAY': config('EMAIL_OUTBOX_RETRY_DELAY', default=60, cast=int),
+    'POLL_INTERVAL': config('EMAIL_OUTBOX_POLL_INTERVAL', default=5, cast=float),
+}
+
 
 # Django Rest Framework Settings
 REST_FRAMEWORK = {
@@ -181,5 +268,11 @@ REST_FRAMEWORK = {
     'DEFAULT_VERSIONING_CLASS': 'utilities.restful.versioning.APIHeaderVersioning',
     'DEFAULT_PAGINATION_CLASS': 'utilities.restful.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': config('THROTTLE_LOGIN_IP_RATE', default='60/min'),
+        'login_facility': config('THROTTLE_LOGIN_FACILITY_RATE', default='600/min'),
+        'login_username': config('THROTTLE_LOGIN_USERNAME_RATE', default='10/min'),
+        'activation_ip': config('THROTTLE_ACTIVATION_IP_RATE', default='30/min'),
+    },
     'EXCEPTION_HANDLER': 'utilities.restful.exceptions.exception_handler',
 }
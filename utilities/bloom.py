@@ -0,0 +1,123 @@
+from hashlib import blake2b
+from math import ceil, log
+
+from django_redis import get_redis_connection
+
+# set bits on filter, on recent additions bitmap, and on the filter being rebuilt if any,
+# so values added while rebuild are not lost
+ADD_SCRIPT = """
+local rebuilding = redis.call('EXISTS', KEYS[2]) == 1
+for _, position in ipairs(ARGV) do
+    redis.call('SETBIT', KEYS[1], position, 1)
+    redis.call('SETBIT', KEYS[3], position, 1)
+    if rebuilding then
+        redis.call('SETBIT', KEYS[2], position, 1)
+    end
+end
+"""
+
+# start filter being rebuilt from recent additions, they may be saved by transactions not visible
+# to rebuild database snapshot yet
+START_REBUILD_SCRIPT = """
+redis.call('DEL', KEYS[1])
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    redis.call('RENAME', KEYS[2], KEYS[1])
+else
+    redis.call('SETBIT', KEYS[1], ARGV[1], 0)
+end
+"""
+
+
+class BloomFilter:
+    """
+    Bloom filter saved as redis bitmap, answer "definitely not added" or "maybe added".
+    values never removed, removed values become false positives until filter rebuilt.
+
+    filter is not used until first rebuild finish, see ``start_rebuild`` and ``finish_rebuild``.
+    values added since previous rebuild started are kept by next rebuild, so removed values
+    may stay for two rebuilds.
+    """
+
+    def __init__(self, key: str, capacity: int = 1000000, error_rate: float = 0.001):
+        self.key = key
+        # optimal bits count and hashes count for expected capacity and false positive rate
+        self.size = ceil(-capacity * log(error_rate) / log(2) ** 2)
+        self.hashes = max(round(self.size / capacity * log(2)), 1)
+        self._script = None
+        self._start_script = None
+
+    @property
+    def connection(self):
+        return get_redis_connection('default')
+
+    @property
+    def rebuild_key(self) -> str:
+        return f'{self.key}:rebuild'
+
+    @property
+    def recent_key(self) -> str:
+        return f'{self.key}:recent'
+
+    @property
+    def ready_key(self) -> str:
+        return f'{self.key}:ready'
+
+    def positions(self, value: str) -> list:
+        digest = blake2b(value.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'big'), int.from_bytes(digest[8:], 'big')
+        return [(first + index * second) % self.size for index in range(self.hashes)]
+
+    def add(self, *values: str) -> None:
+        positions = [position for value in values if value for position in self.positions(value)]
+        if not positions:
+            return
+        if self._script is None:
+            self._script = self.connection.register_script(ADD_SCRIPT)
+        self._script(keys=[self.key, self.rebuild_key, self.recent_key], args=positions)
+
+    def contains(self, values) -> dict:
+        """
+        check many values with one round trip
+        :return: dict of value and False if value definitely not added, True if it may be added.
+            None if filter not ready to use
+        """
+        values = list(values)
+        with self.connection.pipeline(transaction=False) as pipeline:
+            pipeline.exists(self.ready_key)
+            for value in values:
+                for position in self.positions(value):
+                    pipeline.getbit(self.key, position)
+            ready, *bits = pipeline.execute()
+
+        if not ready:
+            return None
+        return {
+            value: all(bits[index * self.hashes:(index + 1) * self.hashes])
+            for index, value in enumerate(values)
+        }
+
+    def start_rebuild(self) -> None:
+        """
+        start new filter contain values added since previous rebuild started, values added to both filters
+        until ``finish_rebuild`` called
+        """
+        if self._start_script is None:
+            self._start_script = self.connection.register_script(START_REBUILD_SCRIPT)
+        self._start_script(keys=[self.rebuild_key, self.recent_key], args=[self.size - 1])
+
+    def add_to_rebuild(self, values) -> None:
+        with self.connection.pipeline(transaction=False) as pipeline:
+            for value in values:
+                if value:
+                    for position in self.positions(value):
+                        pipeline.setbit(self.rebuild_key, position, 1)
+            pipeline.execute()
+
+    def finish_rebuild(self) -> None:
+        with self.connection.pipeline() as pipeline:
+            pipeline.rename(self.rebuild_key, self.key)
+            pipeline.set(self.ready_key, 1)
+            pipeline.execute()
+
+    def clear(self) -> None:
+        self.connection.delete(self.key, self.rebuild_key, self.recent_key, self.ready_key)
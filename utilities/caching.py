@@ -0,0 +1,217 @@
+from collections import OrderedDict
+from hashlib import sha256
+from threading import Lock
+from time import monotonic
+
+from django.core.cache import cache as default_cache
+from django.db import transaction
+
+MISSING = object()
+
+
+def digest(value: str) -> str:
+    """
+    hash sensitive values (tokens, codes) before using them as cache keys,
+    so raw secrets never appear on cache server
+    """
+    return sha256(value.encode()).hexdigest()
+
+
+class CacheStats:
+    """
+    process wide counters used to measure how much load cache layer save
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def record(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.local_hits = self.shared_hits = self.misses = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.local_hits + self.shared_hits + self.misses
+        return {
+            'local_hits': self.local_hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.misses,
+            'hit_ratio': (self.local_hits + self.shared_hits) / lookups if lookups else 0.0,
+        }
+
+
+class LocalCache:
+    """
+    small thread safe in-process LRU cache, every entry expire after ``timeout`` seconds
+    """
+
+    def __init__(self, max_size: int = 1024, timeout: float = 30):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, MISSING)
+            if entry is MISSING:
+                return default
+            expire_at, value = entry
+            if expire_at <= monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout: float = None) -> None:
+        if self.max_size <= 0:
+            return
+        timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            self._data[key] = (monotonic() + timeout, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class TieredCache:
+    """
+    two level cache, a local LRU (L1) in front of shared django cache (L2 - redis)
+    L1 entries are not invalidated on other processes, so keep ``local_timeout`` short
+    """
+
+    def __init__(self, prefix: str, timeout: int = 300, local_size: int = 1024, local_timeout: float = 30, backend=None):
+        self.prefix = prefix
+        self.timeout = timeout
+        self.local = LocalCache(max_size=local_size, timeout=local_timeout)
+        self.backend = backend or default_cache
+        self.stats = CacheStats()
+
+    def make_key(self, key) -> str:
+        return f'{self.prefix}:{key}'
+
+    def get(self, key, default=None, remember_miss: bool = False):
+        """
+        :param key: cache key without prefix
+        :param default: returned value when key not found
+        :param remember_miss: keep ``default`` on local cache when key not found,
+            so repeated lookups of missing key stay on local process
+        """
+        cache_key = self.make_key(key)
+        value = self.local.get(cache_key, MISSING)
+        if value is not MISSING:
+            self.stats.record('local_hits')
+            return value
+
+        value = self.backend.get(cache_key, MISSING)
+        if value is not MISSING:
+            self.stats.record('shared_hits')
+            self.local.set(cache_key, value)
+            return value
+
+        self.stats.record('misses')
+        if remember_miss:
+            self.local.set(cache_key, default)
+        return default
+
+    def set(self, key, value, timeout: int = MISSING) -> None:
+        cache_key = self.make_key(key)
+        self.backend.set(cache_key, value, timeout=self.timeout if timeout is MISSING else timeout)
+        self.local.set(cache_key, value)
+
+    def delete(self, *keys) -> None:
+        cache_keys = [self.make_key(key) for key in keys]
+        for cache_key in cache_keys:
+            self.local.delete(cache_key)
+        self.backend.delete_many(cache_keys)
+
+    def invalidate(self, *keys) -> None:
+        """
+        delete keys now, and again when current transaction commit, so values cached
+        from old rows by concurrent requests before commit are not kept
+        """
+        self.delete(*keys)
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(lambda: self.delete(*keys))
+
+
+class ModelGenerations:
+    """
+    shared counter per model bumped on every change of its rows, used to version cached values
+    built from model rows, so they are invalidated by changing the key instead of deleting values.
+    models registered by ``watch`` bumped by save/delete signals, bulk operations must call ``bump``
+    """
+
+    def __init__(self, prefix: str = 'generation', backend=None):
+        self.prefix = prefix
+        self.backend = backend or default_cache
+        self.models = {}
+
+    def make_key(self, model) -> str:
+        return f'{self.prefix}:{model._meta.label_lower}'
+
+    def watch(self, *models) -> None:
+        from django.db.models.signals import post_delete, post_save
+
+        for model in models:
+            self.models[model._meta.db_table] = model
+            uid = f'{self.prefix}:{model._meta.label_lower}'
+            post_save.connect(self._bump_from_signal, sender=model, dispatch_uid=uid)
+            post_delete.connect(self._bump_from_signal, sender=model, dispatch_uid=uid)
+
+    def _bump_from_signal(self, sender, **kwargs) -> None:
+        self.bump(sender)
+
+    def bump(self, *models) -> None:
+        """
+        bump now, and again when current transaction commit, so values cached from old rows
+        by concurrent requests before commit are keyed by retired generation
+        """
+        self._bump(models)
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(lambda: self._bump(models))
+
+    def _bump(self, models) -> None:
+        for model in models:
+            key = self.make_key(model)
+            try:
+                self.backend.incr(key)
+            except ValueError:
+                # first change of model, or counter evicted
+                self.backend.set(key, 1, timeout=None)
+
+    def get_many(self, models) -> dict:
+        """
+        :return: dict of model label and its current generation, 0 if never changed
+        """
+        keys = {self.make_key(model): model._meta.label_lower for model in models}
+        values = self.backend.get_many(keys)
+        return {label: values.get(key, 0) for key, label in keys.items()}
+
+    def models_of_queryset(self, queryset) -> list:
+        """
+        :return: watched models used by queryset tables (main table and joins)
+        """
+        tables = {queryset.model._meta.db_table}
+        tables.update(join.table_name for join in queryset.query.alias_map.values())
+        return [self.models[table] for table in sorted(tables) if table in self.models]
+
+
+model_generations = ModelGenerations()
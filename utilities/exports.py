@@ -0,0 +1,47 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+# spreadsheets evaluate cells start with these characters as formulas
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class _Echo:
+    """
+    file like object return written value, so csv writer produce lines without buffering
+    """
+
+    def write(self, value):
+        return value
+
+
+def escape_cell(value):
+    """
+    prefix text start with formula character by quote, so user input never run as spreadsheet formula
+    """
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def csv_lines(rows, fields: dict):
+    """
+    :param rows: iterable of dicts, ex: queryset ``values()`` iterator
+    :param fields: dict of row key and its column header
+    :return: generator of csv lines, header line yielded before first row fetched
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields.values())
+    for row in rows:
+        yield writer.writerow([escape_cell(row[key]) for key in fields])
+
+
+def jsonl_lines(rows, fields: dict):
+    """
+    :param rows: iterable of dicts, ex: queryset ``values()`` iterator
+    :param fields: dict of row key and its name on output object
+    :return: generator of json lines
+    """
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    for row in rows:
+        yield encoder.encode({name: row[key] for key, name in fields.items()}) + '\n'
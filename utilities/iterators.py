@@ -0,0 +1,13 @@
+from itertools import islice
+
+
+def chunked(iterable, size: int):
+    """
+    split iterable into lists of ``size`` items, last list may be shorter
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
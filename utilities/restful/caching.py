@@ -0,0 +1,51 @@
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.http import HttpResponse
+
+from utilities.caching import TieredCache, digest
+
+_options = getattr(settings, 'RESPONSE_CACHE', {})
+
+# rendered list responses, keys contain scope generation so entries never invalidated, only retired
+response_cache = TieredCache(
+    prefix='response',
+    timeout=_options.get('TIMEOUT', 300),
+    local_size=_options.get('LOCAL_SIZE', 256),
+    local_timeout=_options.get('LOCAL_TIMEOUT', 30),
+)
+
+
+class CachedListMixin:
+    """
+    List view mixin cache rendered responses per scope, API version and query params.
+
+    views implement ``get_cache_scope`` to return string identify the shared payload scope and its
+    current generation (ex: "<facility id>:<generation>"), so changing the generation retire all scope
+    entries without scanning keys. return None to skip the cache.
+    """
+
+    def get_cache_scope(self):
+        raise NotImplementedError('.get_cache_scope() must be overridden')
+
+    def get_cache_key(self, scope: str) -> str:
+        params = urlencode(sorted(self.request.query_params.lists()), doseq=True)
+        return f'{self.basename}:{scope}:{self.request.version}:{digest(params)}'
+
+    def list(self, request, *args, **kwargs):
+        scope = self.get_cache_scope()
+        if scope is None:
+            return super().list(request, *args, **kwargs)
+
+        key = self.get_cache_key(scope)
+        cached = response_cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.add_post_render_callback(
+                lambda rendered: response_cache.set(key, (rendered.content, rendered['Content-Type']))
+            )
+        return response
@@ -0,0 +1,26 @@
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+class ConditionalListMixin:
+    """
+    List view mixin answer ``If-None-Match`` / ``If-Modified-Since`` with 304 before the queryset evaluated,
+    views implement ``get_list_stamp`` to return (etag, last modified timestamp) of the list, or None to skip.
+    etag must change with anything may change response body.
+    """
+
+    def get_list_stamp(self):
+        raise NotImplementedError('.get_list_stamp() must be overridden')
+
+    def list(self, request, *args, **kwargs):
+        stamp = self.get_list_stamp()
+        if stamp is None:
+            return super().list(request, *args, **kwargs)
+
+        etag, last_modified = stamp
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
@@ -0,0 +1,48 @@
+from django.core.exceptions import FieldDoesNotExist
+
+
+def source_path(model, source: str):
+    """
+    :return: orm lookup path of dotted field source if it is a concrete model field, else None
+    """
+    parts = source.split('.')
+    for index, part in enumerate(parts):
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        if index < len(parts) - 1:
+            if not field.is_relation:
+                return None
+            model = field.related_model
+        elif not field.concrete:
+            return None
+    return '__'.join(parts)
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin keep only fields requested by ``fields`` query param (comma separated),
+    ex: ?fields=username,is_chief
+    unknown names ignored, all fields kept if param missing or no known field requested.
+
+    views select only requested columns by ``CompiledSerializer.values_queryset``.
+    """
+    fields_query_param = 'fields'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = self.get_requested_fields(self.context.get('request'), self.fields)
+        if requested:
+            for name in set(self.fields) - requested:
+                self.fields.pop(name)
+
+    @classmethod
+    def get_requested_fields(cls, request, fields) -> set:
+        """
+        :return: requested names of given fields, empty set if nothing requested
+        """
+        value = request.query_params.get(cls.fields_query_param) if request is not None else None
+        if not value:
+            return set()
+        return {name.strip() for name in value.split(',')} & set(fields)
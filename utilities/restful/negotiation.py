@@ -0,0 +1,11 @@
+from rest_framework.negotiation import DefaultContentNegotiation
+
+
+class IgnoreClientContentNegotiation(DefaultContentNegotiation):
+    """
+    select first renderer whatever client Accept header, used by views return ready files (ex: streaming exports)
+    so clients asking for the file type (ex: "Accept: text/csv") not rejected, errors rendered by first renderer.
+    """
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
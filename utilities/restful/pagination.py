@@ -1,8 +1,72 @@
+import json
 from collections import OrderedDict
 
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination as RestCursorPagination
 from rest_framework.pagination import PageNumberPagination as RestPageNumberPagination
 from rest_framework.response import Response
 
+from utilities.caching import MISSING, TieredCache, digest, model_generations
+from utilities.restful.versioning import APIVersion
+
+
+def estimate_count(queryset) -> int:
+    """
+    rows count estimated by postgres planner statistics, without scanning the table.
+    exact count used on other database vendors
+    """
+    if connections[queryset.db].vendor != 'postgresql':
+        return queryset.count()
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+_count_options = getattr(settings, 'PAGINATION_COUNT_CACHE', {})
+
+# exact counts cached by query signature, ``count_cache.stats`` hits are the avoided count queries
+count_cache = TieredCache(
+    prefix='pagination:count',
+    timeout=_count_options.get('TIMEOUT', 60),
+    local_size=_count_options.get('LOCAL_SIZE', 1024),
+    local_timeout=_count_options.get('LOCAL_TIMEOUT', 30),
+)
+
+
+def cached_count(queryset, timeout: int = MISSING) -> int:
+    """
+    exact rows count cached by query sql and generations of its watched models (see ``model_generations``),
+    so the same filtered list counted once per ``timeout`` or until one of its models changed
+    """
+    sql, params = queryset.order_by().query.sql_with_params()
+    generations = model_generations.get_many(model_generations.models_of_queryset(queryset))
+    key = digest(f'{sql}:{params}:{sorted(generations.items())}')
+
+    count = count_cache.get(key)
+    if count is None:
+        count = queryset.count()
+        count_cache.set(key, count, timeout)
+    return count
+
+
+class CachedCountPaginator(Paginator):
+    """
+    django paginator with count cached by ``cached_count``
+    """
+
+    @cached_property
+    def count(self):
+        if not hasattr(self.object_list, 'query'):
+            return super().count
+        return cached_count(self.object_list)
+
 
 class PageNumberPagination(RestPageNumberPagination):
     """
@@ -18,7 +82,12 @@ class PageNumberPagination(RestPageNumberPagination):
         'result': the data of list,
         'status: flag to get status of response
     }
+    page size can be changed by "page_size" query param up to ``max_page_size``,
+    count cached while list models not changed, see ``cached_count``
     """
+    django_paginator_class = CachedCountPaginator
+    page_size_query_param = 'page_size'
+    max_page_size = 100
 
     def get_paginated_response(self, data):
         return Response(OrderedDict([
@@ -30,3 +99,76 @@ class PageNumberPagination(RestPageNumberPagination):
             ('result', data),
             ('status', True),
         ]))
+
+
+class CursorPagination(RestCursorPagination):
+    """
+    Keyset pagination, every page fetched by index seek from the cursor position without OFFSET or COUNT(*).
+    Response:
+    {
+        'next': next pagination link,
+        'previous': previous pagination link,
+        'count': included only if count enabled, see ``count_mode``
+        'result': the data of list,
+        'status: flag to get status of response
+    }
+    ``count_mode`` (or view ``pagination_count`` attribute) is one of:
+        None: no count
+        'approximate': count estimated by database planner statistics
+        'cached': exact count cached, see ``cached_count``
+    ``ordering`` must be unique and indexed, it may be overridden by view ``cursor_ordering`` attribute.
+    """
+    ordering = '-pk'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    count_mode = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.ordering = getattr(view, 'cursor_ordering', self.ordering)
+        self.count = None
+        count_mode = getattr(view, 'pagination_count', self.count_mode)
+        if count_mode == 'approximate':
+            self.count = estimate_count(queryset)
+        elif count_mode == 'cached':
+            self.count = cached_count(queryset)
+        elif count_mode is not None:
+            raise ValueError(f'Unknown pagination count mode "{count_mode}"')
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+        ])
+        if self.count is not None:
+            response['count'] = self.count
+        response['result'] = data
+        response['status'] = True
+        return Response(response)
+
+
+class VersionedPaginationMixin:
+    """
+    View mixin select pagination class by request API version,
+    ``versioned_pagination_classes`` is sequence of (minimum version, pagination class)
+    the greatest matched minimum version win, otherwise ``pagination_class`` used.
+        versioned_pagination_classes = (('1.2.0.0', CursorPagination),)
+    """
+    versioned_pagination_classes = ()
+
+    def get_pagination_class(self):
+        version = getattr(self.request, 'version', None)
+        selected, selected_version = self.pagination_class, None
+        if isinstance(version, APIVersion):
+            for minimum, pagination_class in self.versioned_pagination_classes:
+                minimum = APIVersion(minimum)
+                if version >= minimum and (selected_version is None or minimum > selected_version):
+                    selected, selected_version = pagination_class, minimum
+        return selected
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            pagination_class = self.get_pagination_class()
+            self._paginator = None if pagination_class is None else pagination_class()
+        return self._paginator
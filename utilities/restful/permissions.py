@@ -0,0 +1,55 @@
+from rest_framework.permissions import BasePermission, DjangoModelPermissions
+
+
+def get_permission_set(request):
+    """
+    :return: compiled permission set of authenticated user, None for anonymous users
+    """
+    user = request.user
+    if not user or not user.is_authenticated:
+        return None
+    return user.permission_set
+
+
+class IsFacilityStaff(BasePermission):
+    """
+    Allow only users work on facility
+    """
+
+    def has_permission(self, request, view):
+        permission_set = get_permission_set(request)
+        return bool(permission_set and permission_set.is_facility_staff)
+
+
+class IsFacilityChief(BasePermission):
+    """
+    Allow only facility chiefs, chief have permission cross all branches
+    """
+
+    def has_permission(self, request, view):
+        permission_set = get_permission_set(request)
+        return bool(permission_set and permission_set.is_facility_staff and permission_set.is_chief)
+
+
+class ModelPermissions(DjangoModelPermissions):
+    """
+    Django model permissions checked against user compiled permission set, without database lookup.
+    read requests require model "view" permission
+    """
+    perms_map = {
+        **DjangoModelPermissions.perms_map,
+        'GET': ['%(app_label)s.view_%(model_name)s'],
+        'HEAD': ['%(app_label)s.view_%(model_name)s'],
+    }
+
+    def has_permission(self, request, view):
+        if getattr(view, '_ignore_model_permissions', False):
+            return True
+
+        permission_set = get_permission_set(request)
+        if permission_set is None:
+            return False
+
+        queryset = self._queryset(view)
+        perms = self.get_required_permissions(request.method, queryset.model)
+        return permission_set.has_perms(perms)
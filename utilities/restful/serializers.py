@@ -0,0 +1,97 @@
+from operator import attrgetter, itemgetter
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import F
+from django.utils.functional import cached_property
+from rest_framework import serializers
+
+from utilities.restful.fieldsets import source_path
+
+
+def _dotted_getter(attrs: list):
+    """
+    :return: getter of dotted attributes, None returned when one of them is None or missing relation like DRF
+    """
+    if len(attrs) == 1:
+        return attrgetter(attrs[0])
+
+    def getter(instance):
+        for attr in attrs:
+            if instance is None:
+                return None
+            try:
+                instance = getattr(instance, attr)
+            except ObjectDoesNotExist:
+                return None
+        return instance
+    return getter
+
+
+class CompiledSerializer(serializers.ModelSerializer):
+    """
+    Read-only model serializer render every row by accessors compiled once per serializer,
+    instead of DRF ``get_attribute``/``to_representation`` calls of every field.
+    rows may be model instances or dicts from ``values_queryset`` (keyed by fields names).
+
+    fields sources must be attributes, properties or dotted relations attributes (ex: "user.username")
+    values of ``plain_fields`` returned as they are, other fields values converted by field ``to_representation``.
+    set ``compiled = False`` to render by DRF default path.
+    """
+    compiled = True
+    plain_fields = (
+        serializers.ReadOnlyField,
+        serializers.BooleanField,
+        serializers.CharField,
+        serializers.IntegerField,
+        serializers.FloatField,
+    )
+
+    def compile_field(self, name: str, field) -> tuple:
+        """
+        :return: tuple of (field name, (instance getter, row getter), value converter or None)
+        """
+        if isinstance(field, serializers.SerializerMethodField):
+            method = getattr(self, field.method_name)
+            return name, (method, method), None
+
+        convert = None if isinstance(field, self.plain_fields) else field.to_representation
+        if field.source == '*':
+            return name, (field.to_representation, field.to_representation), None
+        return name, (_dotted_getter(field.source_attrs), itemgetter(name)), convert
+
+    @cached_property
+    def accessors(self) -> list:
+        return [self.compile_field(name, field) for name, field in self.fields.items() if not field.write_only]
+
+    def to_representation(self, instance):
+        if not self.compiled:
+            return super().to_representation(instance)
+
+        index = 1 if isinstance(instance, dict) else 0
+        data = {}
+        for name, getters, convert in self.accessors:
+            value = getters[index](instance)
+            data[name] = value if convert is None or value is None else convert(value)
+        return data
+
+    @classmethod
+    def values_queryset(cls, queryset, request=None, *extra: str):
+        """
+        select fields as ``values()`` rows keyed by fields names, fields pruned by request (see ``SparseFieldsetMixin``)
+        queryset returned as is if some field not backed by model field (ex: method or property field)
+        :param queryset: model queryset
+        :param request: request of sparse fieldsets
+        :param extra: names of model fields or annotations always selected, ex: cursor ordering
+        field named after queryset annotation selected by the annotation, so it must hold the field value
+        """
+        fields = cls(context={'request': request}).fields
+        names, expressions = set(extra), {}
+        for name, field in fields.items():
+            path = source_path(queryset.model, field.source)
+            if path is None:
+                return queryset
+            if path == name or name in queryset.query.annotations:
+                names.add(name)
+            else:
+                expressions[name] = F(path)
+        return queryset.values(*sorted(names), **expressions)
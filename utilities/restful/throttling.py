@@ -0,0 +1,132 @@
+from time import time
+from uuid import uuid4
+
+from django_redis import get_redis_connection
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from utilities.caching import LocalCache
+
+# count the request only if window not full, and return seconds to wait when it is full
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[3]) then
+    redis.call('ZADD', KEYS[1], now, ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], math.ceil(window * 1000))
+    return '0'
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return tostring(tonumber(oldest[2]) + window - now)
+"""
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Limit requests count in a sliding time window, the window saved on redis sorted set
+    and checked/updated atomically by lua script. rate defined by ``scope`` on
+    ``DEFAULT_THROTTLE_RATES`` setting ex: '10/min'.
+
+    Throttled clients rejected on local process until their wait time passed,
+    without any redis round trip.
+    """
+    scope = None
+    key_prefix = 'throttle'
+    durations = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    blocked = LocalCache(max_size=10000, timeout=60)
+    _script = None
+
+    def __init__(self):
+        self.wait_time = None
+
+    @classmethod
+    def get_script(cls):
+        if SlidingWindowThrottle._script is None:
+            SlidingWindowThrottle._script = get_redis_connection('default').register_script(SLIDING_WINDOW_SCRIPT)
+        return SlidingWindowThrottle._script
+
+    @classmethod
+    def reset_history(cls, ident: str = '*') -> None:
+        """
+        forget throttling history, to unblock clients
+        :param ident: client identity, by default all clients of this scope (all scopes if called on base class)
+        """
+        connection = get_redis_connection('default')
+        keys = list(connection.scan_iter(match=f'{cls.key_prefix}:{cls.scope or "*"}:{ident}'))
+        if keys:
+            connection.delete(*keys)
+        cls.blocked.clear()
+
+    def parse_rate(self, rate: str) -> tuple:
+        """
+        :param rate: string in format 'number/period', period is one of: second, minute, hour, day
+        :return: tuple of (allowed requests, duration in seconds)
+        """
+        num, period = rate.split('/')
+        return int(num), self.durations[period[0]]
+
+    def get_rate(self):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_ident_value(self, request, view):
+        """
+        value used to identify the client, return None to skip throttling
+        """
+        raise NotImplementedError('.get_ident_value() must be overridden')
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_value(request, view)
+        if ident is None:
+            return None
+        return f'{self.key_prefix}:{self.scope}:{ident}'
+
+    def allow_request(self, request, view):
+        rate = self.get_rate()
+        key = rate and self.get_cache_key(request, view)
+        if not key:
+            return True
+
+        now = time()
+        blocked_until = self.blocked.get(key)
+        if blocked_until and blocked_until > now:
+            self.wait_time = blocked_until - now
+            return False
+
+        num_requests, duration = self.parse_rate(rate)
+        wait = float(self.get_script()(keys=[key], args=[now, duration, num_requests, f'{now}:{uuid4().hex}']))
+        if wait <= 0:
+            return True
+
+        self.wait_time = wait
+        self.blocked.set(key, now + wait, timeout=wait)
+        return False
+
+    def wait(self):
+        return self.wait_time
+
+
+class IPSlidingWindowThrottle(SlidingWindowThrottle):
+    """
+    throttle requests by client IP address
+    """
+
+    def get_ident_value(self, request, view):
+        return self.get_ident(request)
+
+
+class DataSlidingWindowThrottle(SlidingWindowThrottle):
+    """
+    throttle requests by values of request body fields, ex: username
+    """
+    data_fields = ()
+    max_value_length = 64
+
+    def get_ident_value(self, request, view):
+        try:
+            values = [request.data.get(field) for field in self.data_fields]
+        except AttributeError:
+            return None
+        if not all(isinstance(value, str) and value for value in values):
+            return None
+        return ':'.join(value.lower()[:self.max_value_length] for value in values)
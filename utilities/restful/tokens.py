@@ -0,0 +1,38 @@
+from django.core import signing
+
+SIGNED_TOKEN_SALT = 'utilities.restful.tokens.SignedToken'
+
+
+class SignedToken:
+    """
+    Stateless API token, signed with HMAC by ``SECRET_KEY``, carry user id, token version and issue time.
+    token can verified without database or cache access, and revoked by increase user token version
+
+        <user id>.<token version>:<issue timestamp>:<signature>
+    """
+    signer = signing.TimestampSigner(salt=SIGNED_TOKEN_SALT)
+
+    @staticmethod
+    def is_signed(key: str) -> bool:
+        # database tokens are hex strings, signed tokens always contain signer separator
+        return ':' in key
+
+    @classmethod
+    def make(cls, user_id: int, version: int) -> str:
+        return cls.signer.sign(f'{user_id}.{version}')
+
+    @classmethod
+    def read(cls, key: str, max_age=None) -> tuple:
+        """
+        verify token signature and extract it's payload
+        :param key: signed token string
+        :param max_age: max allowed token age in seconds or timedelta, None mean never expire
+        :return: tuple of (user id, token version)
+        :raise signing.BadSignature: if token tampered, expired or malformed
+        """
+        value = cls.signer.unsign(key, max_age=max_age)
+        try:
+            user_id, version = value.split('.')
+            return int(user_id), int(version)
+        except ValueError:
+            raise signing.BadSignature('Malformed token payload')
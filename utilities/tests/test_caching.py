@@ -0,0 +1,86 @@
+from time import sleep
+
+from django.db import transaction
+from django.test import SimpleTestCase, TransactionTestCase
+
+from corporations.models import Facility
+from utilities.caching import LocalCache, ModelGenerations, TieredCache
+
+
+class TestLocalCache(SimpleTestCase):
+    def test_least_recently_used_evicted(self):
+        local = LocalCache(max_size=2, timeout=60)
+        local.set('a', 1)
+        local.set('b', 2)
+        local.get('a')
+        local.set('c', 3)
+
+        self.assertEqual(local.get('a'), 1)
+        self.assertIsNone(local.get('b'))
+        self.assertEqual(local.get('c'), 3)
+
+    def test_expired_entry(self):
+        local = LocalCache(max_size=2, timeout=0.01)
+        local.set('a', 1)
+        sleep(0.02)
+        self.assertIsNone(local.get('a'))
+        self.assertEqual(len(local), 0)
+
+
+class TestTieredCache(SimpleTestCase):
+    def setUp(self) -> None:
+        self.cache = TieredCache(prefix='test:tiered', timeout=60)
+
+    def test_hit_and_miss_counters(self):
+        self.assertIsNone(self.cache.get('key'))
+        self.cache.set('key', 'value')
+        self.assertEqual(self.cache.get('key'), 'value')
+
+        # drop local copy to read it from shared cache
+        self.cache.local.clear()
+        self.assertEqual(self.cache.get('key'), 'value')
+
+        stats = self.cache.stats.as_dict()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['local_hits'], 1)
+        self.assertEqual(stats['shared_hits'], 1)
+
+    def test_delete(self):
+        self.cache.set('key', 'value')
+        self.cache.delete('key')
+        self.assertIsNone(self.cache.get('key'))
+        self.assertIsNone(self.cache.backend.get(self.cache.make_key('key')))
+
+    def tearDown(self) -> None:
+        self.cache.delete('key')
+
+
+class TestTieredCacheInvalidation(TransactionTestCase):
+    def setUp(self) -> None:
+        self.cache = TieredCache(prefix='test:tiered', timeout=60)
+
+    def test_invalidate_again_on_commit(self):
+        self.cache.set('key', 'value')
+        with transaction.atomic():
+            self.cache.invalidate('key')
+            self.assertIsNone(self.cache.get('key'))
+            # refilled by concurrent request from rows committed before this transaction
+            self.cache.set('key', 'stale')
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_invalidate_outside_transaction(self):
+        self.cache.set('key', 'value')
+        self.cache.invalidate('key')
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_generation_bumped_again_on_commit(self):
+        generations = ModelGenerations(prefix='test:generation')
+        with transaction.atomic():
+            generations.bump(Facility)
+            # generation read by concurrent request before commit
+            generation = generations.get_many([Facility])['corporations.facility']
+        self.assertGreater(generations.get_many([Facility])['corporations.facility'], generation)
+        generations.backend.delete(generations.make_key(Facility))
+
+    def tearDown(self) -> None:
+        self.cache.delete('key')
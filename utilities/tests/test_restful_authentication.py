@@ -0,0 +1,90 @@
+from django.test import TestCase
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework.exceptions import AuthenticationFailed
+
+from utilities.restful.authentication import TokenAuthentication, principal_cache, revoke_token, revoked_tokens
+
+
+class TestTokenAuthentication(TestCase):
+    def setUp(self) -> None:
+        self.user = baker.make('authentication.User', username='token_user')
+        self.user.generate_token()
+        self.authentication = TokenAuthentication()
+
+    def test_cached_user(self):
+        user, _ = self.authentication.authenticate_credentials(self.user.token)
+        self.assertEqual(user.id, self.user.id)
+
+        with self.assertNumQueries(0):
+            user, _ = self.authentication.authenticate_credentials(self.user.token)
+        self.assertEqual(user.id, self.user.id)
+        self.assertEqual(user.username, 'token_user')
+        self.assertFalse(user._state.adding)
+
+    def test_regenerated_token_invalidated(self):
+        old_token = self.user.token
+        self.authentication.authenticate_credentials(old_token)
+
+        self.user.generate_token()
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(old_token)
+        user, _ = self.authentication.authenticate_credentials(self.user.token)
+        self.assertEqual(user.id, self.user.id)
+
+    def test_deactivated_user_invalidated(self):
+        self.authentication.authenticate_credentials(self.user.token)
+
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(self.user.token)
+
+    def test_deleted_user_invalidated(self):
+        token = self.user.token
+        self.authentication.authenticate_credentials(token)
+
+        self.user.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(token)
+
+    def test_expired_token(self):
+        self.user.token_expires = timezone.now() - timezone.timedelta(minutes=1)
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(self.user.token)
+
+    def test_revoked_token(self):
+        self.authentication.authenticate_credentials(self.user.token)
+
+        revoke_token(self.user.token)
+        with self.assertNumQueries(0), self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(self.user.token)
+
+    def test_signed_token(self):
+        token = self.user.generate_signed_token()
+        user, _ = self.authentication.authenticate_credentials(token)
+        self.assertEqual(user.id, self.user.id)
+
+        with self.assertNumQueries(0):
+            self.authentication.authenticate_credentials(token)
+
+    def test_tampered_signed_token(self):
+        token = self.user.generate_signed_token()
+        user_part, rest = token.split('.', 1)
+        with self.assertNumQueries(0), self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(f'{int(user_part) + 1}.{rest}')
+
+    def test_revoked_signed_token(self):
+        token = self.user.generate_signed_token()
+        self.authentication.authenticate_credentials(token)
+
+        self.user.revoke_signed_tokens()
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(token)
+        user, _ = self.authentication.authenticate_credentials(self.user.generate_signed_token())
+        self.assertEqual(user.id, self.user.id)
+
+    def tearDown(self) -> None:
+        principal_cache.local.clear()
+        revoked_tokens.local.clear()
@@ -0,0 +1,71 @@
+from django.test import TestCase
+from model_bakery import baker
+from rest_framework.test import APIRequestFactory
+
+from corporations.models import Employee, Facility
+from utilities.caching import model_generations
+from utilities.restful.pagination import (
+    CursorPagination,
+    PageNumberPagination,
+    VersionedPaginationMixin,
+    cached_count,
+    count_cache,
+    estimate_count,
+)
+from utilities.restful.versioning import APIVersion
+
+
+class TestCounts(TestCase):
+    def setUp(self) -> None:
+        baker.make('corporations.Facility', _quantity=3)
+
+    def test_estimate_count(self):
+        self.assertIsInstance(estimate_count(Facility.objects.all()), int)
+        self.assertGreaterEqual(estimate_count(Facility.objects.filter(is_active=True)), 0)
+
+    def test_cached_count(self):
+        queryset = Facility.objects.filter(is_active=True)
+        self.assertEqual(cached_count(queryset), 3)
+
+        count_cache.stats.reset()
+        with self.assertNumQueries(0):
+            self.assertEqual(cached_count(Facility.objects.filter(is_active=True)), 3)
+        self.assertEqual(count_cache.stats.local_hits, 1)
+
+    def test_cached_count_invalidated_by_model_change(self):
+        queryset = Facility.objects.filter(is_active=True)
+        self.assertEqual(cached_count(queryset), 3)
+
+        baker.make('corporations.Facility')
+        self.assertEqual(cached_count(queryset), 4)
+
+        # bulk update skip signals
+        Facility.objects.update(is_active=False)
+        self.assertEqual(cached_count(queryset), 4)
+        model_generations.bump(Facility)
+        self.assertEqual(cached_count(queryset), 0)
+
+    def test_joined_models_generations(self):
+        queryset = Employee.objects.filter(facility__is_active=True).select_related('user')
+        self.assertEqual(model_generations.models_of_queryset(queryset), [Employee, Facility])
+
+
+class TestVersionedPagination(TestCase):
+    class View(VersionedPaginationMixin):
+        pagination_class = PageNumberPagination
+        versioned_pagination_classes = (
+            ('1.2.0.0', CursorPagination),
+            ('1.3.0.0', None),
+        )
+
+    def get_paginator(self, version: str):
+        view = self.View()
+        view.request = APIRequestFactory().get('/')
+        view.request.version = APIVersion(version)
+        return view.paginator
+
+    def test_select_by_version(self):
+        self.assertIsInstance(self.get_paginator('1.1.0.0'), PageNumberPagination)
+        self.assertIsInstance(self.get_paginator('1.2.0.0'), CursorPagination)
+        self.assertIsInstance(self.get_paginator('1.2.5.0'), CursorPagination)
+        self.assertIsNone(self.get_paginator('1.3.0.0'))
@@ -0,0 +1,68 @@
+from django.test import TestCase
+from model_bakery import baker
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory
+from rest_framework.request import Request
+
+from corporations.models import Employee
+from utilities.restful.fieldsets import SparseFieldsetMixin
+from utilities.restful.serializers import CompiledSerializer
+
+
+class EmployeeSerializer(SparseFieldsetMixin, CompiledSerializer):
+    username = serializers.ReadOnlyField(source='user.username')
+    joined = serializers.DateTimeField(source='user.date_joined')
+    label = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Employee
+        fields = 'username', 'joined', 'is_chief', 'label',
+
+    def get_label(self, instance) -> str:
+        username = instance['username'] if isinstance(instance, dict) else instance.user.username
+        return f'{username} ({instance["is_chief"] if isinstance(instance, dict) else instance.is_chief})'
+
+
+class RowSerializer(SparseFieldsetMixin, CompiledSerializer):
+    username = serializers.ReadOnlyField(source='user.username')
+
+    class Meta:
+        model = Employee
+        fields = 'username', 'is_chief',
+
+
+class TestCompiledSerializer(TestCase):
+    def setUp(self) -> None:
+        self.employees = baker.make('corporations.Employee', is_chief=True, _quantity=3)
+
+    def test_same_representation_as_model_serializer(self):
+        queryset = Employee.objects.select_related('user').order_by('pk')
+        compiled = EmployeeSerializer(queryset, many=True).data
+        rest = type('RestEmployeeSerializer', (EmployeeSerializer,), {'compiled': False})(queryset, many=True).data
+        self.assertEqual([dict(row) for row in rest], [dict(row) for row in compiled])
+        self.assertTrue(compiled[0]['joined'].endswith('Z') or '+' in compiled[0]['joined'])
+
+    def test_dotted_source_of_missing_relation(self):
+        serializer = RowSerializer()
+        self.assertEqual(serializer.to_representation(Employee(is_chief=False)), {'username': None, 'is_chief': False})
+
+    def test_values_rows(self):
+        queryset = RowSerializer.values_queryset(Employee.objects.order_by('pk'))
+        rows = list(queryset)
+        self.assertEqual(set(rows[0]), {'username', 'is_chief'})
+        self.assertEqual(
+            RowSerializer(rows, many=True).data,
+            [{'username': employee.user.username, 'is_chief': True} for employee in self.employees]
+        )
+
+    def test_values_rows_of_sparse_fieldset(self):
+        request = Request(APIRequestFactory().get('/', {'fields': 'is_chief'}))
+        queryset = RowSerializer.values_queryset(Employee.objects.order_by('pk'), request, 'id')
+        rows = list(queryset)
+        self.assertEqual(set(rows[0]), {'id', 'is_chief'})
+        self.assertEqual(RowSerializer(rows, many=True, context={'request': request}).data[0], {'is_chief': True})
+
+    def test_values_rows_with_method_field(self):
+        # method fields may need model instance, so queryset not changed
+        queryset = Employee.objects.all()
+        self.assertIs(EmployeeSerializer.values_queryset(queryset), queryset)